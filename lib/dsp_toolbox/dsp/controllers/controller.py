@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Generic, Optional
+import numpy as np
 
 from dsp_toolbox.dsp.types import (
     InputType,
@@ -8,9 +9,10 @@ from dsp_toolbox.dsp.types import (
     Limits,
     T
 )
+from dsp_toolbox.dsp.snapshot import Snapshotable
 
 
-class BaseController(ABC, Generic[InputType, OutputType, TimeType]):
+class BaseController(ABC, Snapshotable, Generic[InputType, OutputType, TimeType]):
     """
     An abstract base class for controllers to implement
     """
@@ -55,8 +57,14 @@ class BaseController(ABC, Generic[InputType, OutputType, TimeType]):
 
         If limits is None, the input value is returned unchanged.
         Otherwise, limits must be a (low, high) pair defining the allowble range that
-        the output must fall within.
+        the output must fall within. Array values (batched loops) are clipped elementwise
+        and either bound may itself be an array of per-loop bounds, also when the value
+        is a scalar shared by all loops.
         """
         if limits is None:
             return value
-        return min(max(value, limits[0]), limits[1])
+        low, high = limits
+        if isinstance(value, np.ndarray) or isinstance(low, np.ndarray) or isinstance(high, np.ndarray):
+            return np.clip(value, low, high)
+        return min(max(value, low), high)
+
@@ -0,0 +1,100 @@
+from bisect import bisect_right
+from typing import Optional, Sequence, Union
+import numpy as np
+
+from dsp_toolbox.dsp.types import (
+    InputType,
+    OutputType,
+    TimeType,
+    PIDGains,
+    T
+)
+from dsp_toolbox.dsp.controllers.controller import BaseController
+from dsp_toolbox.dsp.controllers.pid import PIDController
+from dsp_toolbox.dsp.controllers.pid_bank import PIDControllerBank
+
+
+class GainScheduledPID(BaseController[InputType, OutputType, TimeType]):
+    """
+    PID whose gains are interpolated from a table indexed by a scheduling variable
+
+    gains[i] applies at breakpoints[i], which must be increasing; in between the gains
+    are linear in the scheduling variable, and beyond the ends they are held. The
+    slope of each segment is precomputed, so a lookup is a bisection and one
+    multiply-add per gain. The scheduling variable defaults to the measured value.
+
+    Gain changes are bumpless: the integrated error is rescaled so the integral term
+    carries over when ki changes. A PIDController in fixed-rate mode is already
+    bumpless and is left alone. With a PIDControllerBank, every loop is scheduled on
+    its own element of a (num_loops,) scheduling variable.
+    """
+    state_attributes = ("controller",)
+
+    def __init__(
+        self,
+        breakpoints: Sequence[T],
+        gains: Sequence[PIDGains],
+        controller: Union[PIDController, PIDControllerBank]
+    ) -> None:
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        if len(self.breakpoints) != len(gains):
+            raise ValueError("Need one set of gains per breakpoint")
+        if np.any(np.diff(self.breakpoints) <= 0):
+            raise ValueError("Breakpoints must be increasing")
+        self.table = np.array([[g.Kp, g.Ki, g.Kd] for g in gains], dtype=float)
+        self.slopes = np.diff(self.table, axis=0) / np.diff(self.breakpoints)[:, None]
+        self.breakpoint_list = self.breakpoints.tolist()
+        self.table_rows = self.table.tolist()
+        self.slope_rows = self.slopes.tolist()
+        self.controller = controller
+        self.batched = isinstance(controller, PIDControllerBank)
+
+    def lookup(self, x: Union[T, np.ndarray]) -> PIDGains:
+        """Gains at x, arrays of gains for an array of x"""
+        if np.ndim(x):
+            return PIDGains(*(np.interp(x, self.breakpoints, column) for column in self.table.T))
+        if len(self.breakpoint_list) == 1:
+            return PIDGains(*self.table_rows[0])
+        last = len(self.breakpoint_list) - 2
+        segment = min(max(bisect_right(self.breakpoint_list, x) - 1, 0), last)
+        start = self.breakpoint_list[segment]
+        offset = min(max(x, start), self.breakpoint_list[segment + 1]) - start
+        return PIDGains(*(
+            gain + slope * offset for gain, slope in zip(self.table_rows[segment], self.slope_rows[segment])
+        ))
+
+    def schedule(self, x: Union[T, np.ndarray]) -> PIDGains:
+        """Move the controller to the gains at x without a bump in its output"""
+        gains = self.lookup(x)
+        if self.batched:
+            bank = self.controller
+            ki = np.broadcast_to(gains.Ki, bank.ki.shape)
+            bank.integrated_error = bank.integrated_error * np.divide(
+                bank.ki, ki, out=np.ones(bank.num_loops), where=ki != 0
+            )
+            bank.kp[:] = gains.Kp
+            bank.ki[:] = ki
+            bank.kd[:] = gains.Kd
+            return gains
+
+        pid = self.controller
+        # the integral term can only be carried over to a nonzero ki
+        if pid.sample_time is None and gains.Ki != 0:
+            pid.integrated_error = pid.integrated_error * (pid.ki / gains.Ki)
+        pid.set_kp(gains.Kp)
+        pid.set_ki(gains.Ki)
+        pid.set_kd(gains.Kd)
+        return gains
+
+    def reset(self) -> None:
+        self.controller.reset()
+
+    def __call__(
+        self,
+        value: InputType,
+        setpoint: InputType,
+        t: Optional[TimeType] = None,
+        scheduling_variable: Optional[Union[T, np.ndarray]] = None
+    ) -> OutputType:
+        self.schedule(value if scheduling_variable is None else scheduling_variable)
+        return self.controller(value, setpoint, t)
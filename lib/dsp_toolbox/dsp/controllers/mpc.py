@@ -0,0 +1,209 @@
+import math
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+from dsp_toolbox.dsp.types import (
+    InputType,
+    OutputType,
+    TimeType,
+    Limits
+)
+from dsp_toolbox.dsp.controllers.controller import BaseController
+from dsp_toolbox.dsp.models.state_space_model import StateSpaceModel
+
+
+@lru_cache(maxsize=256)
+def _condensed(
+    a_bytes: bytes,
+    b_bytes: bytes,
+    c_bytes: bytes,
+    q_bytes: bytes,
+    r_bytes: bytes,
+    num_states: int,
+    num_inputs: int,
+    num_outputs: int,
+    horizon: int
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    A = np.frombuffer(a_bytes).reshape(num_states, num_states)
+    B = np.frombuffer(b_bytes).reshape(num_states, num_inputs)
+    C = np.frombuffer(c_bytes).reshape(num_outputs, num_states)
+    Q = np.frombuffer(q_bytes).reshape(num_outputs, num_outputs)
+    R = np.frombuffer(r_bytes).reshape(num_inputs, num_inputs)
+
+    # predicted outputs over the horizon are free + forced: Y = Phi x + Gamma U
+    powers = [np.eye(num_states)]
+    for _ in range(horizon):
+        powers.append(A @ powers[-1])
+    free = np.vstack([C @ power for power in powers[1:]])
+    forced = np.zeros((horizon * num_outputs, horizon * num_inputs))
+    for i in range(horizon):
+        for j in range(i + 1):
+            forced[i * num_outputs:(i + 1) * num_outputs, j * num_inputs:(j + 1) * num_inputs] = \
+                C @ powers[i - j] @ B
+
+    # input moves are D U - E u_prev, with u_prev the input applied last
+    moves = np.eye(horizon * num_inputs) - np.eye(horizon * num_inputs, k=-num_inputs)
+    first = np.zeros((horizon * num_inputs, num_inputs))
+    first[:num_inputs] = np.eye(num_inputs)
+    output_weight = np.kron(np.eye(horizon), Q)
+    move_weight = np.kron(np.eye(horizon), R)
+    reference = np.kron(np.ones((horizon, 1)), np.eye(num_outputs))
+
+    weighted_forced = forced.T @ output_weight
+    weighted_moves = moves.T @ move_weight
+    hessian = weighted_forced @ forced + weighted_moves @ moves
+    linear = np.hstack((weighted_forced @ free, -weighted_forced @ reference, -weighted_moves @ first))
+    gain = -cho_solve(cho_factor(hessian), linear)
+    lipschitz = float(np.linalg.eigvalsh(hessian)[-1])
+    gain.flags.writeable = False
+    hessian.flags.writeable = False
+    return gain, hessian, lipschitz
+
+
+def condensed_qp(
+    A: np.ndarray,
+    B: np.ndarray,
+    C: np.ndarray,
+    Q: np.ndarray,
+    R: np.ndarray,
+    horizon: int
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Condensed MPC problem for x[k + 1] = A x[k] + B u[k], y = C x over horizon steps,
+    with output tracking weight Q and input move weight R
+
+    Returns the gain mapping [x, reference, previous input] to the unconstrained
+    optimal input sequence, the Hessian of the QP in that sequence and the Hessian's
+    largest eigenvalue. Cached by the arguments, and read-only.
+    """
+    A = np.atleast_2d(np.asarray(A, dtype=float))
+    B = np.asarray(B, dtype=float).reshape(A.shape[0], -1)
+    C = np.asarray(C, dtype=float).reshape(-1, A.shape[0])
+    Q = np.asarray(Q, dtype=float).reshape(C.shape[0], C.shape[0])
+    R = np.asarray(R, dtype=float).reshape(B.shape[1], B.shape[1])
+    return _condensed(
+        A.tobytes(), B.tobytes(), C.tobytes(), Q.tobytes(), R.tobytes(),
+        A.shape[0], B.shape[1], C.shape[0], int(horizon)
+    )
+
+
+def weight_matrix(weight: Union[float, np.ndarray], size: int) -> np.ndarray:
+    """A scalar weight is the same weight on every element, a vector a diagonal"""
+    weight = np.asarray(weight, dtype=float)
+    if weight.ndim < 2:
+        return np.diag(np.broadcast_to(weight, (size,)))
+    return weight.reshape(size, size)
+
+
+class ModelPredictiveController(BaseController[InputType, OutputType, TimeType]):
+    """
+    Linear MPC tracking a setpoint on y = C x, C defaulting to the full state
+
+    value is the measured state x and setpoint the output reference. Each call
+    minimizes, over the next horizon inputs, the Q-weighted squared tracking error of
+    the predicted outputs plus the R-weighted squared input moves, and applies the
+    first input. Weighting moves rather than inputs leaves no steady-state offset.
+
+    The condensed QP depends only on the model, weights and horizon, so it is built
+    and factorized once. The unconstrained optimum is then a single matrix-vector
+    product; only when it violates input_limits is the box-constrained QP solved, by
+    accelerated projected gradient warm-started from the previous solution. The
+    controller assumes a fixed rate, t is ignored.
+    """
+    state_attributes = ("last_input", "solution")
+
+    def __init__(
+        self,
+        A: np.ndarray,
+        B: np.ndarray,
+        horizon: int,
+        Q: Union[float, np.ndarray],
+        R: Union[float, np.ndarray],
+        input_limits: Optional[Limits[OutputType]] = None,
+        C: Optional[np.ndarray] = None,
+        max_iterations: int = 200,
+        tolerance: float = 1e-6
+    ) -> None:
+        self.A = np.atleast_2d(np.asarray(A, dtype=float))
+        self.num_states = self.A.shape[0]
+        self.B = np.asarray(B, dtype=float).reshape(self.num_states, -1)
+        self.num_inputs = self.B.shape[1]
+        if C is None:
+            C = np.eye(self.num_states)
+        self.C = np.asarray(C, dtype=float).reshape(-1, self.num_states)
+        self.num_outputs = self.C.shape[0]
+        self.horizon = horizon
+        self.Q = weight_matrix(Q, self.num_outputs)
+        self.R = weight_matrix(R, self.num_inputs)
+        self.input_limits = input_limits
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.gain, self.hessian, self.lipschitz = condensed_qp(
+            self.A, self.B, self.C, self.Q, self.R, horizon
+        )
+        if input_limits is not None:
+            self.lower = np.tile(np.broadcast_to(np.asarray(input_limits[0], dtype=float), (self.num_inputs,)), horizon)
+            self.upper = np.tile(np.broadcast_to(np.asarray(input_limits[1], dtype=float), (self.num_inputs,)), horizon)
+        self.reset()
+
+    @classmethod
+    def from_model(
+        cls,
+        model: StateSpaceModel,
+        horizon: int,
+        Q: Union[float, np.ndarray],
+        R: Union[float, np.ndarray],
+        input_limits: Optional[Limits[OutputType]] = None,
+        **kwargs
+    ) -> "ModelPredictiveController":
+        """Controller for the discretized plant of a model, tracking its output"""
+        return cls(model.Ad, model.Bd, horizon, Q, R, input_limits, C=model.C, **kwargs)
+
+    def reset(self) -> None:
+        self.last_input = np.zeros(self.num_inputs)
+        self.solution = np.zeros(self.horizon * self.num_inputs)
+
+    def solve(self, unconstrained: np.ndarray) -> np.ndarray:
+        """
+        Input sequence minimizing the QP within the input limits, by FISTA with step
+        1 / L and adaptive restart, from the shifted previous solution. The gradient
+        of the QP is H (U - unconstrained).
+        """
+        m = self.num_inputs
+        step = 1.0 / self.lipschitz
+        current = np.clip(np.concatenate((self.solution[m:], self.solution[-m:])), self.lower, self.upper)
+        extrapolated = current
+        momentum = 1.0
+        for _ in range(self.max_iterations):
+            gradient = self.hessian @ (extrapolated - unconstrained)
+            following = np.clip(extrapolated - step * gradient, self.lower, self.upper)
+            change = following - current
+            if np.max(np.abs(change)) <= self.tolerance:
+                return following
+            if gradient @ change > 0.0:
+                # the momentum is pointing uphill, restart it
+                momentum = 1.0
+            next_momentum = 0.5 * (1.0 + math.sqrt(1.0 + 4.0 * momentum * momentum))
+            extrapolated = following + ((momentum - 1.0) / next_momentum) * change
+            current = following
+            momentum = next_momentum
+        return current
+
+    def __call__(
+        self,
+        value: InputType,
+        setpoint: InputType,
+        t: Optional[TimeType] = None,
+    ) -> OutputType:
+        x = np.asarray(value, dtype=float).reshape(self.num_states)
+        reference = np.broadcast_to(np.asarray(setpoint, dtype=float), (self.num_outputs,))
+        inputs = self.gain @ np.concatenate((x, reference, self.last_input))
+        if self.input_limits is not None and (np.any(inputs < self.lower) or np.any(inputs > self.upper)):
+            inputs = self.solve(inputs)
+        self.solution = inputs
+        self.last_input = inputs[:self.num_inputs].copy()
+        if self.num_inputs == 1:
+            return float(self.last_input[0])
+        return self.last_input.copy()
@@ -11,6 +11,28 @@ from dsp_toolbox.dsp.types import(
 from dsp_toolbox.dsp.controllers.controller import BaseController
 
 class PIDController(BaseController[InputType, OutputType, TimeType]):
+    """
+    PID controller on the error setpoint - value
+
+    By default the time step comes from t, or the clock, on every call. With
+    sample_time set the controller instead assumes a fixed rate and ignores t: the
+    discrete coefficients are computed once, and again only when a gain changes, and
+    each call is an increment on the previous command (velocity form). The derivative
+    is filtered with time constant derivative_filter, and the integrator is wound
+    back towards the saturated output with gain antiwindup_gain (back-calculation).
+    Gain changes are bumpless in this mode. Only output_limits apply, not the
+    p, i and d term limits.
+    """
+    state_attributes = (
+        "last_error",
+        "last_time",
+        "integrated_error",
+        "p_term",
+        "i_term",
+        "d_term",
+        "last_command",
+        "last_output"
+    )
 
     def __init__(
         self,
@@ -21,6 +43,9 @@ class PIDController(BaseController[InputType, OutputType, TimeType]):
         p_limits: Optional[Limits[OutputType]] = None,
         i_limits: Optional[Limits[OutputType]] = None,
         d_limits: Optional[Limits[OutputType]] = None,
+        sample_time: Optional[TimeType] = None,
+        derivative_filter: TimeType = 0.0,
+        antiwindup_gain: float = 0.0,
     ) -> None:
         self.kp = kp
         self.ki = ki
@@ -29,21 +54,42 @@ class PIDController(BaseController[InputType, OutputType, TimeType]):
         self.p_limits = p_limits
         self.d_limits = d_limits
         self.i_limits = i_limits
+        self.sample_time = sample_time
+        self.derivative_filter = derivative_filter
+        self.antiwindup_gain = antiwindup_gain
+        self.update_coefficients()
         self.reset()
 
+    def update_coefficients(self) -> None:
+        """Discrete coefficients of the fixed-rate mode"""
+        if self.sample_time is None:
+            return
+        smoothing = self.sample_time + self.derivative_filter
+        self.ki_step = self.ki * self.sample_time
+        self.kd_step = self.kd / smoothing
+        self.derivative_decay = self.derivative_filter / smoothing
+        self.antiwindup_step = self.antiwindup_gain * self.sample_time
+
     def reset(self) -> None:
         self.last_error = None
         self.last_time = None
         self.integrated_error = 0.0
-        
+        self.p_term = 0.0
+        self.i_term = 0.0
+        self.d_term = 0.0
+        self.last_command = None
+        self.last_output = None
+
     def set_kp(self, kp: float):
         self.kp = kp
 
     def set_ki(self, ki: float):
         self.ki = ki
+        self.update_coefficients()
 
     def set_kd(self, kd: float):
         self.kd = kd
+        self.update_coefficients()
 
     def __call__(
         self,
@@ -51,6 +97,8 @@ class PIDController(BaseController[InputType, OutputType, TimeType]):
         setpoint: InputType,
         t: Optional[TimeType] = None,
     ) -> OutputType:
+        if self.sample_time is not None:
+            return self.fixed_rate_step(value, setpoint)
         if t is None:
             t = cast(TimeType, time.monotonic())
         error = cast(InputType, setpoint - value)
@@ -86,4 +134,40 @@ class PIDController(BaseController[InputType, OutputType, TimeType]):
         )
         self.last_error = error
         self.last_time = t
+        self.p_term = p_term
+        self.i_term = i_term
+        self.d_term = d_term
+        return output
+
+    def fixed_rate_step(
+        self,
+        value: InputType,
+        setpoint: InputType
+    ) -> OutputType:
+        error = setpoint - value
+        if self.last_command is None:
+            # start as if the proportional term alone had been applied so far
+            self.last_error = error
+            self.last_command = self.kp * error
+            self.last_output = self.last_command
+            self.d_term = 0.0
+
+        delta_error = error - self.last_error
+        d_term = self.kd_step * delta_error + self.derivative_decay * self.d_term
+        command = (
+            self.last_command
+            + self.kp * delta_error
+            + self.ki_step * error
+            + self.antiwindup_step * (self.last_output - self.last_command)
+            + d_term
+            - self.d_term
+        )
+        output = self.limit(command, self.output_limits)
+
+        self.p_term = self.kp * error
+        self.d_term = d_term
+        self.i_term = command - self.p_term - d_term
+        self.last_error = error
+        self.last_command = command
+        self.last_output = output
         return output
@@ -0,0 +1,127 @@
+import logging
+import time
+from typing import Optional, Union
+import numpy as np
+
+from dsp_toolbox.dsp.types import (
+    InputType,
+    OutputType,
+    TimeType,
+    Limits
+)
+from dsp_toolbox.dsp.controllers.controller import BaseController
+
+
+class PIDControllerBank(BaseController[InputType, OutputType, TimeType]):
+    """
+    num_loops independent PID loops evaluated together
+
+    Each loop behaves exactly like a PIDController, but gains, limits and state are
+    (num_loops,) arrays and a call takes the (num_loops,) measurement and setpoint
+    vectors, so the cost per tick is a fixed number of NumPy operations. Gains and
+    limit bounds may be scalars shared by all loops. The clock is read once per call
+    when t is not given; t may also be a per-loop array.
+
+    Loops whose enabled flag is False are frozen: their state is untouched and they
+    hold their last output. Reset a loop before re-enabling it unless the elapsed time
+    should be integrated.
+    """
+    state_attributes = (
+        "last_error",
+        "last_time",
+        "integrated_error",
+        "p_term",
+        "i_term",
+        "d_term",
+        "output",
+        "enabled"
+    )
+
+    def __init__(
+        self,
+        kp: Union[float, np.ndarray],
+        ki: Union[float, np.ndarray],
+        kd: Union[float, np.ndarray],
+        output_limits: Limits[OutputType],
+        num_loops: int,
+        p_limits: Optional[Limits[OutputType]] = None,
+        i_limits: Optional[Limits[OutputType]] = None,
+        d_limits: Optional[Limits[OutputType]] = None,
+    ) -> None:
+        self.num_loops = num_loops
+        self.kp = self.per_loop(kp)
+        self.ki = self.per_loop(ki)
+        self.kd = self.per_loop(kd)
+        self.output_limits = output_limits
+        self.p_limits = p_limits
+        self.i_limits = i_limits
+        self.d_limits = d_limits
+        self.enabled = np.ones(num_loops, dtype=bool)
+        self.output = np.zeros(num_loops)
+        self.last_error = np.full(num_loops, np.nan)
+        self.last_time = np.full(num_loops, np.nan)
+        self.integrated_error = np.zeros(num_loops)
+        self.p_term = np.zeros(num_loops)
+        self.i_term = np.zeros(num_loops)
+        self.d_term = np.zeros(num_loops)
+
+    def per_loop(self, value: Union[float, np.ndarray]) -> np.ndarray:
+        return np.array(np.broadcast_to(np.asarray(value, dtype=float), (self.num_loops,)))
+
+    def reset(self, loops=None) -> None:
+        """
+        Reset all loops, or only those selected by loops (indices, a slice or a boolean
+        mask). Reset loops act as if freshly constructed on their next update.
+        """
+        if loops is None:
+            loops = slice(None)
+        self.last_error[loops] = np.nan
+        self.last_time[loops] = np.nan
+        self.integrated_error[loops] = 0.0
+        self.p_term[loops] = 0.0
+        self.i_term[loops] = 0.0
+        self.d_term[loops] = 0.0
+        self.output[loops] = 0.0
+
+    def set_kp(self, kp: Union[float, np.ndarray], loops=None):
+        self.kp[slice(None) if loops is None else loops] = kp
+
+    def set_ki(self, ki: Union[float, np.ndarray], loops=None):
+        self.ki[slice(None) if loops is None else loops] = ki
+
+    def set_kd(self, kd: Union[float, np.ndarray], loops=None):
+        self.kd[slice(None) if loops is None else loops] = kd
+
+    def __call__(
+        self,
+        value: InputType,
+        setpoint: InputType,
+        t: Optional[TimeType] = None,
+    ) -> np.ndarray:
+        if t is None:
+            t = time.monotonic()
+        error = np.asarray(setpoint - value, dtype=float)
+
+        started = ~np.isnan(self.last_time)
+        dt = np.where(started, t - self.last_time, 0.0)
+        nonpositive = started & (dt <= 0.0) & self.enabled
+        if nonpositive.any():
+            logging.warning("Time delta is nonpositive for %d loops, setting dedt to 0", nonpositive.sum())
+        dt = np.maximum(dt, 0.0)
+        dedt = np.divide(error - self.last_error, dt, out=np.zeros(self.num_loops), where=dt > 0.0)
+
+        integrated_error = self.integrated_error + error * dt
+        p_term = self.limit(error * self.kp, self.p_limits)
+        i_term = self.limit(integrated_error * self.ki, self.i_limits)
+        d_term = self.limit(dedt * self.kd, self.d_limits)
+        output = self.limit(p_term + i_term + d_term, self.output_limits)
+
+        enabled = self.enabled
+        self.integrated_error = np.where(enabled, integrated_error, self.integrated_error)
+        self.last_error = np.where(enabled, error, self.last_error)
+        self.last_time = np.where(enabled, t, self.last_time)
+        self.p_term = np.where(enabled, p_term, self.p_term)
+        self.i_term = np.where(enabled, i_term, self.i_term)
+        self.d_term = np.where(enabled, d_term, self.d_term)
+        self.output = np.where(enabled, output, self.output)
+        return self.output.copy()
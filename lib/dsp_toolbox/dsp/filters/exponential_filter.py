@@ -1,4 +1,6 @@
 from typing import Optional
+import numpy as np
+from scipy.signal import lfilter
 
 from dsp_toolbox.dsp.types import (
     InputType,
@@ -9,13 +11,23 @@ from dsp_toolbox.dsp.filters.filter import BaseFilter
 
 
 class ExponentialFilter(BaseFilter[InputType, OutputType]):
+    """
+    y[n] = alpha * x[n] + (1 - alpha) * y[n - 1], starting from the first value
+
+    With channels set, each update takes a (channels,) vector and blocks are shaped
+    (channels, num_samples); alpha is shared or given per channel.
+    """
+    state_attributes = ("buffer", "initialized")
+
     def __init__(
         self,
-        alpha: float
+        alpha: float,
+        channels: Optional[int] = None
     ) -> None:
         super().__init__()
         self.buffer: T
-        self.alpha: T = alpha
+        self.alpha: T = alpha if np.ndim(alpha) == 0 else np.asarray(alpha, dtype=float)
+        self.channels = channels
         self.initialized: bool = False
         self.initial_value: Optional[T] = None
         self.reset()
@@ -25,6 +37,8 @@ class ExponentialFilter(BaseFilter[InputType, OutputType]):
         value: T
     ) -> T:
         if not self.initialized:
+            if self.channels is not None:
+                value = np.broadcast_to(np.asarray(value, dtype=float), (self.channels,)).copy()
             self.buffer = value
             self.initialized = True
             return value
@@ -32,6 +46,37 @@ class ExponentialFilter(BaseFilter[InputType, OutputType]):
         self.buffer = ret
         return ret
     
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        if values.shape[-1] == 0:
+            return np.empty(values.shape)
+        if not self.initialized:
+            first = self.update(values[..., 0])
+            return np.concatenate([np.asarray(first)[..., None], self.process(values[..., 1:])], axis=-1)
+        decay = 1 - self.alpha
+        zi = np.asarray(decay * self.buffer)[..., None]
+        if np.ndim(self.alpha) == 0:
+            output, _ = lfilter([self.alpha], [1.0, -decay], values, axis=-1, zi=zi)
+        else:
+            output = np.stack([
+                lfilter([alpha], [1.0, -decay[c]], values[c], zi=zi[c])[0]
+                for c, alpha in enumerate(self.alpha)
+            ])
+        self.buffer = output[..., -1].copy()
+        return output
+
+    def to_sos(self) -> Optional[np.ndarray]:
+        if np.ndim(self.alpha):
+            return None
+        return np.array([[self.alpha, 0.0, 0.0, 1.0, self.alpha - 1, 0.0]])
+
+    @property
+    def starts_settled(self) -> bool:
+        return True
+
     def reset(self):
         self.buffer = 0
         self.initialized = False
@@ -1,13 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Generic
+from typing import Generic, Optional
+import numpy as np
 
 from dsp_toolbox.dsp.types import (
     InputType,
     OutputType
 )
+from dsp_toolbox.dsp.snapshot import Snapshotable
 
 
-class BaseFilter(ABC, Generic[InputType, OutputType]):
+class BaseFilter(ABC, Snapshotable, Generic[InputType, OutputType]):
     @abstractmethod
     def update(
         self,
@@ -15,10 +17,33 @@ class BaseFilter(ABC, Generic[InputType, OutputType]):
     ) -> OutputType:
         raise RuntimeError("Can't call base filter")
     
+    @abstractmethod
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        """Filter a block of samples, same as calling update on each in turn"""
+        raise RuntimeError("Can't call base filter")
+
     @abstractmethod
     def reset(self) -> None:
         raise RuntimeError("Can't call base filter")
     
+    def to_sos(self) -> Optional[np.ndarray]:
+        """
+        Second-order sections of a linear time-invariant filter, or None if the filter
+        is nonlinear or its coefficients differ between channels
+        """
+        return None
+
+    @property
+    def starts_settled(self) -> bool:
+        """
+        Whether the filter starts in the steady state of its first input, the start of
+        an SOSFilter, so that it can be fused with other stages without changing output
+        """
+        return False
+
     @property
     @abstractmethod
     def is_initialized(self) -> bool:
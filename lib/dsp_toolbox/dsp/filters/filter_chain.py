@@ -0,0 +1,97 @@
+import copy
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+from dsp_toolbox.dsp.types import (
+    InputType,
+    OutputType,
+    T
+)
+from dsp_toolbox.dsp.filters.filter import BaseFilter
+from dsp_toolbox.dsp.filters.sos_filter import SOSFilter
+
+
+class FilterChain(BaseFilter[InputType, OutputType]):
+    """
+    Filters applied in series, each stage feeding the next
+
+    Runs of adjacent linear time-invariant stages with the same channel count are
+    fused into one SOSFilter holding all of their sections, so each run costs a single
+    call per sample or block. Stages that can't be fused, e.g. MedianFilter, run on
+    their own between the fused runs.
+
+    The chain owns its stages: the filters passed in only serve as specifications and
+    are copied. A fused run starts settled on its first input. So that fusion never
+    changes the output, only stages that start the same way and have not run yet are
+    fused. An IIRFilter with an initial_value or a gain other than 1 at DC, e.g. a
+    highpass, keeps its own start and runs on its own.
+    """
+    def __init__(
+        self,
+        filters: Sequence[BaseFilter]
+    ) -> None:
+        super().__init__()
+        self.stages: List[BaseFilter] = []
+        run: List[BaseFilter] = []
+        for stage in filters:
+            fusable = self.fusable(stage)
+            if fusable and run and getattr(stage, "channels", None) == getattr(run[0], "channels", None):
+                run.append(stage)
+                continue
+            self.stages.extend(self.fuse(run))
+            run = [stage] if fusable else []
+            if not fusable:
+                self.stages.append(copy.deepcopy(stage))
+        self.stages.extend(self.fuse(run))
+
+    @staticmethod
+    def fusable(stage: BaseFilter) -> bool:
+        return stage.to_sos() is not None and stage.starts_settled and not stage.is_initialized
+
+    @staticmethod
+    def fuse(run: List[BaseFilter]) -> List[BaseFilter]:
+        if len(run) < 2:
+            return [copy.deepcopy(stage) for stage in run]
+        sos = np.concatenate([stage.to_sos() for stage in run])
+        return [SOSFilter(sos, channels=getattr(run[0], "channels", None))]
+
+    def update(
+        self,
+        value: T
+    ) -> T:
+        for stage in self.stages:
+            value = stage.update(value)
+        return value
+
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        for stage in self.stages:
+            values = stage.process(values)
+        return values
+
+    def to_sos(self) -> Optional[np.ndarray]:
+        sections = [stage.to_sos() for stage in self.stages]
+        if any(sos is None for sos in sections):
+            return None
+        return np.concatenate(sections)
+
+    @property
+    def starts_settled(self) -> bool:
+        return all(stage.starts_settled for stage in self.stages)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"stages": [stage.get_state() for stage in self.stages]}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        for stage, stage_state in zip(self.stages, state["stages"]):
+            stage.set_state(stage_state)
+
+    def reset(self) -> None:
+        for stage in self.stages:
+            stage.reset()
+
+    @property
+    def is_initialized(self) -> bool:
+        return all(stage.is_initialized for stage in self.stages)
@@ -0,0 +1,125 @@
+from typing import Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from dsp_toolbox.dsp.types import (
+    InputType,
+    OutputType,
+    T
+)
+from dsp_toolbox.dsp.filters.filter import BaseFilter
+
+
+class FIRFilter(BaseFilter[InputType, OutputType]):
+    """
+    y[n] = sum(taps[k] * x[n - k])
+
+    The last num_taps inputs are kept in a ring buffer, every sample written twice
+    num_taps apart, so each update is a single dot product over a contiguous slice.
+    The history starts out filled with the first value.
+
+    Blocks with fewer than fft_threshold taps are convolved directly. Longer kernels
+    use FFT overlap-save with the tap spectrum computed once, which costs O(log num_taps)
+    per sample instead of O(num_taps). With channels set, each update takes a
+    (channels,) vector and blocks are shaped (channels, num_samples).
+    """
+    state_attributes = ("buffer", "index", "initialized")
+
+    def __init__(
+        self,
+        taps: np.ndarray,
+        channels: Optional[int] = None,
+        fft_threshold: int = 64,
+        max_block_samples: int = 2 ** 20
+    ) -> None:
+        super().__init__()
+        self.taps = np.asarray(taps, dtype=float)
+        self.reversed_taps = self.taps[::-1].copy()
+        self.num_taps = len(self.taps)
+        self.channels = channels
+        self.fft_threshold = fft_threshold
+        self.max_block_samples = max_block_samples
+        self.fft_size = 1 << int(4 * self.num_taps - 1).bit_length()
+        self.fft_step = self.fft_size - self.num_taps + 1
+        self.taps_spectrum = np.fft.rfft(self.taps, self.fft_size)
+        self.initialized: bool = False
+        self.reset()
+
+    def update(
+        self,
+        value: T
+    ) -> T:
+        if not self.initialized:
+            self.initialize(value)
+        self.buffer[..., self.index] = value
+        self.buffer[..., self.index + self.num_taps] = value
+        self.index = (self.index + 1) % self.num_taps
+        return self.buffer[..., self.index:self.index + self.num_taps] @ self.reversed_taps
+
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        num_samples = values.shape[-1]
+        if num_samples == 0:
+            return np.empty(values.shape)
+        if not self.initialized:
+            self.initialize(values[..., 0])
+
+        # the num_taps - 1 most recent inputs, oldest first
+        history = self.buffer[..., self.index + 1:self.index + self.num_taps]
+        signal = np.concatenate([history, values], axis=-1)
+        if self.num_taps < self.fft_threshold:
+            output = self.convolve_direct(signal)
+        else:
+            output = self.convolve_fft(signal)
+
+        latest = signal[..., -self.num_taps:]
+        self.buffer[..., :self.num_taps] = latest
+        self.buffer[..., self.num_taps:] = latest
+        self.index = 0
+        return output
+
+    def convolve_direct(self, signal: np.ndarray) -> np.ndarray:
+        windows = sliding_window_view(signal, self.num_taps, axis=-1)
+        output = np.empty(signal.shape[:-1] + (windows.shape[-2],))
+        chunk = max(1, self.max_block_samples // self.num_taps)
+        for start in range(0, output.shape[-1], chunk):
+            output[..., start:start + chunk] = windows[..., start:start + chunk, :] @ self.reversed_taps
+        return output
+
+    def convolve_fft(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Overlap-save: each fft_size segment overlaps the previous one by num_taps - 1
+        samples, and the last fft_step samples of its circular convolution are valid
+        """
+        num_outputs = signal.shape[-1] - self.num_taps + 1
+        num_segments = -(-num_outputs // self.fft_step)
+        padded_length = (num_segments - 1) * self.fft_step + self.fft_size
+        padding = [(0, 0)] * (signal.ndim - 1) + [(0, padded_length - signal.shape[-1])]
+        segments = sliding_window_view(np.pad(signal, padding), self.fft_size, axis=-1)[..., ::self.fft_step, :]
+
+        output = np.empty(signal.shape[:-1] + (num_segments * self.fft_step,))
+        chunk = max(1, self.max_block_samples // self.fft_size)
+        for start in range(0, num_segments, chunk):
+            spectrum = np.fft.rfft(segments[..., start:start + chunk, :], axis=-1) * self.taps_spectrum
+            valid = np.fft.irfft(spectrum, self.fft_size, axis=-1)[..., self.num_taps - 1:]
+            end = min(start + chunk, num_segments)
+            output[..., start * self.fft_step:end * self.fft_step] = valid.reshape(signal.shape[:-1] + (-1,))
+        return output[..., :num_outputs]
+
+    def initialize(self, value: T) -> None:
+        self.buffer[...] = np.asarray(value, dtype=float)[..., None]
+        self.index = 0
+        self.initialized = True
+
+    def reset(self) -> None:
+        channels = () if self.channels is None else (self.channels,)
+        self.buffer = np.zeros(channels + (2 * self.num_taps,))
+        self.index = 0
+        self.initialized = False
+
+    @property
+    def is_initialized(self) -> bool:
+        return self.initialized
@@ -1,4 +1,7 @@
-from typing import Tuple, Iterable, Optional
+from collections import deque
+from typing import Optional
+import numpy as np
+from scipy.signal import lfilter, tf2sos
 
 from dsp_toolbox.dsp.types import (
     InputType,
@@ -8,64 +11,172 @@ from dsp_toolbox.dsp.types import (
 from dsp_toolbox.dsp.filters.filter import BaseFilter
 
 
+def transposed_state(
+    b: np.ndarray,
+    a: np.ndarray,
+    buffer: np.ndarray
+) -> np.ndarray:
+    """
+    Transposed direct form II state equivalent to a history of [x, y] pairs
+
+    buffer has shape (..., order, 2), most recent pair first, and b, a have shape
+    (order + 1,) or broadcast against the leading channel dimensions.
+    """
+    order = buffer.shape[-2]
+    zi = np.empty(buffer.shape[:-1])
+    for m in range(order):
+        zi[..., m] = (
+            np.sum(b[..., m + 1:] * buffer[..., :order - m, 0], axis=-1)
+            - np.sum(a[..., m + 1:] * buffer[..., :order - m, 1], axis=-1)
+        )
+    return zi
+
+
 class IIRFilter(BaseFilter[InputType, OutputType]):
+    """
+    y[n] = sum(m_b[k] * x[n - k]) - sum(m_a[k] * y[n - k]), m_a[0] is taken as 1
+
+    The buffer holds the last order [x, y] pairs, most recent first, and starts out
+    filled with the first value, as if the filter had settled on it. A single channel
+    filter keeps it as a deque of plain floats, so a sample costs a few float
+    multiply-adds rather than NumPy calls on tiny arrays.
+
+    With channels set, each update takes a (channels,) vector and blocks are shaped
+    (channels, num_samples). m_a and m_b are then either shared or given per channel
+    as (channels, order + 1) arrays, and the buffer is a (channels, order, 2) array.
+    """
+    state_attributes = ("buffer", "initialized")
+
     def __init__(
         self,
         m_a,
         m_b,
         order=1,
-        initial_value=None
+        initial_value=None,
+        channels: Optional[int] = None
     ) -> None:
         super().__init__()
-        self.buffer: Iterable[Tuple(T, T)]
-        self.m_a: Iterable[T] = m_a
-        self.m_b: Iterable[T] = m_b
+        self.buffer: np.ndarray
+        self.m_a = m_a
+        self.m_b = m_b
         self.order: int = order
         self.ncoeffs = self.order + 1
+        self.channels = channels
+        self.b = np.asarray(m_b, dtype=float)[..., :self.ncoeffs]
+        self.a = np.array(m_a, dtype=float)[..., :self.ncoeffs]
+        self.a[..., 0] = 1.0
+        self.scalar = channels is None and self.b.ndim == 1 and self.a.ndim == 1
+        if self.scalar:
+            self.b_now = float(self.b[0])
+            self.b_past = self.b[1:].tolist()
+            self.a_past = self.a[1:].tolist()
         self.initialized: bool = False
         self.initial_value: Optional[T] = initial_value
         self.reset()
-        
+
     def update(self, value: T) -> T:
         if not self.is_initialized:
             self.initializeBuffer(value)
-            
-        sum_x = 0.0
-        sum_y = 0.0
-        coeffIdx = 1
-        
-        for item in self.buffer:
-            sum_x += self.m_b[coeffIdx] * item[0]
-            sum_y -= self.m_a[coeffIdx] * item[1]
-            coeffIdx += 1
-            
-        y = self.m_b[0] * value + sum_x + sum_y
+
+        if self.scalar:
+            y = self.b_now * value
+            for (x_past, y_past), b, a in zip(self.buffer, self.b_past, self.a_past):
+                y += b * x_past - a * y_past
+            self.buffer.appendleft([value, y])
+            return y
+
+        history = self.buffer
+        y = (
+            self.b[..., 0] * value
+            + np.sum(self.b[..., 1:] * history[..., 0], axis=-1)
+            - np.sum(self.a[..., 1:] * history[..., 1], axis=-1)
+        )
         self.push_xy(value, y)
         return y
-    
+
     def reset(self):
         self.initialized = False
-        if self.initial_value:
+        if self.initial_value is not None and np.any(self.initial_value):
             self.initializeBuffer(self.initial_value)
-    
+
     def push_xy(
         self,
         x: T,
         y: T
     ) -> None:
-        self.buffer.insert(0, [x, y])
-        self.buffer.pop()
-    
+        if self.scalar:
+            self.buffer.appendleft([x, y])
+            return
+        self.buffer[..., 1:, :] = self.buffer[..., :-1, :]
+        self.buffer[..., 0, 0] = x
+        self.buffer[..., 0, 1] = y
+
     def initializeBuffer(
         self,
         value: T
     ) -> None:
-        self.buffer = []
-        for _ in range(self.order):
-            self.buffer.append([value, value])
-        self.initialized = True       
+        if self.scalar:
+            self.buffer = deque(([value, value] for _ in range(self.order)), maxlen=self.order)
+            self.initialized = True
+            return
+        shape = (self.order, 2) if self.channels is None else (self.channels, self.order, 2)
+        self.buffer = np.empty(shape)
+        self.buffer[...] = np.asarray(value, dtype=float)[..., None, None]
+        self.initialized = True
+
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        """
+        Filter a block of samples, continuing from and updating the buffer
+
+        The buffer is converted to the initial conditions of a transposed direct form II
+        recurrence, so block and update calls can be freely interleaved.
+        """
+        values = np.asarray(values, dtype=float)
+        if values.shape[-1] == 0:
+            return np.empty(values.shape)
+        if not self.is_initialized:
+            self.initializeBuffer(values[..., 0])
+
+        history = self.history()
+        zi = transposed_state(self.b, self.a, history)
+        if self.b.ndim == 1 and self.a.ndim == 1:
+            output, _ = lfilter(self.b, self.a, values, axis=-1, zi=zi)
+        else:
+            b = np.broadcast_to(self.b, (self.channels, self.ncoeffs))
+            a = np.broadcast_to(self.a, (self.channels, self.ncoeffs))
+            output = np.stack([
+                lfilter(b[c], a[c], values[c], zi=zi[c])[0] for c in range(self.channels)
+            ])
+
+        num_new = min(self.order, values.shape[-1])
+        history[..., num_new:, :] = history[..., :self.order - num_new, :].copy()
+        history[..., :num_new, 0] = values[..., :-num_new - 1:-1]
+        history[..., :num_new, 1] = output[..., :-num_new - 1:-1]
+        if self.scalar:
+            self.buffer = deque(history.tolist(), maxlen=self.order)
+        return output
+
+    def history(self) -> np.ndarray:
+        """The buffer as an (..., order, 2) array, the buffer itself when it is one"""
+        if self.scalar:
+            return np.array(self.buffer, dtype=float).reshape(self.order, 2)
+        return self.buffer
+
+    def to_sos(self) -> Optional[np.ndarray]:
+        if self.b.ndim > 1 or self.a.ndim > 1:
+            return None
+        return tf2sos(self.b, self.a)
+
+    @property
+    def starts_settled(self) -> bool:
+        # the buffer starts as [x, x] pairs, the steady state only for unit gain at DC
+        if self.initial_value is not None and np.any(self.initial_value):
+            return False
+        return bool(np.allclose(np.sum(self.b, axis=-1), np.sum(self.a, axis=-1), rtol=1e-9, atol=0.0))
 
     @property
     def is_initialized(self) -> bool:
         return self.initialized
-    
\ No newline at end of file
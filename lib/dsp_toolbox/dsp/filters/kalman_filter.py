@@ -0,0 +1,157 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+from scipy.linalg import solve_discrete_are
+
+from dsp_toolbox.dsp.types import (
+    InputType,
+    OutputType
+)
+from dsp_toolbox.dsp.filters.filter import BaseFilter
+
+
+@lru_cache(maxsize=256)
+def _steady_state(
+    a_bytes: bytes,
+    c_bytes: bytes,
+    q_bytes: bytes,
+    r_bytes: bytes,
+    num_states: int,
+    num_outputs: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    A = np.frombuffer(a_bytes).reshape(num_states, num_states)
+    C = np.frombuffer(c_bytes).reshape(num_outputs, num_states)
+    Q = np.frombuffer(q_bytes).reshape(num_states, num_states)
+    R = np.frombuffer(r_bytes).reshape(num_outputs, num_outputs)
+    P = solve_discrete_are(A.T, C.T, Q, R)
+    K = np.linalg.solve(C @ P @ C.T + R, C @ P).T
+    P.flags.writeable = False
+    K.flags.writeable = False
+    return K, P
+
+
+def steady_state_gain(
+    A: np.ndarray,
+    C: np.ndarray,
+    Q: np.ndarray,
+    R: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Kalman gain and predicted state covariance the filter converges to, from the
+    discrete algebraic Riccati equation. Cached by (A, C, Q, R) and read-only.
+    """
+    A = np.atleast_2d(np.asarray(A, dtype=float))
+    C = np.asarray(C, dtype=float).reshape(-1, A.shape[0])
+    Q = np.asarray(Q, dtype=float).reshape(A.shape)
+    R = np.asarray(R, dtype=float).reshape(C.shape[0], C.shape[0])
+    return _steady_state(A.tobytes(), C.tobytes(), Q.tobytes(), R.tobytes(), A.shape[0], C.shape[0])
+
+
+class KalmanFilter(BaseFilter[InputType, OutputType]):
+    """
+    State estimator for x[k + 1] = A x[k] + w, y[k] = C x[k] + v with process noise
+    covariance Q and measurement noise covariance R
+
+    update takes a measurement, a scalar if there is a single output, and returns the
+    corrected state estimate. x and P hold the prediction for the next sample; without
+    initial_state the first prediction is the least squares fit to the first measurement.
+
+    With channels set, measurements are (channels, num_outputs) and states
+    (channels, num_states). All channels share the model, so they also share the
+    covariance and gain, and each step is a few stacked matrix products whatever the
+    channel count. With steady_state the gain is fixed at its limit from the Riccati
+    equation, computed once, and the covariance is no longer propagated.
+
+    Blocks have time on the last axis: (..., num_outputs, num_samples) in, where the
+    output axis may be left out for a single output, and (..., num_states, num_samples)
+    out.
+    """
+    state_attributes = ("x", "P", "initialized")
+
+    def __init__(
+        self,
+        A: np.ndarray,
+        C: np.ndarray,
+        Q: np.ndarray,
+        R: np.ndarray,
+        initial_state: Optional[np.ndarray] = None,
+        initial_covariance: Optional[np.ndarray] = None,
+        channels: Optional[int] = None,
+        steady_state: bool = False
+    ) -> None:
+        super().__init__()
+        self.A = np.atleast_2d(np.asarray(A, dtype=float))
+        self.num_states = self.A.shape[0]
+        self.C = np.asarray(C, dtype=float).reshape(-1, self.num_states)
+        self.num_outputs = self.C.shape[0]
+        self.Q = np.asarray(Q, dtype=float).reshape(self.A.shape)
+        self.R = np.asarray(R, dtype=float).reshape(self.num_outputs, self.num_outputs)
+        self.channels = channels
+        self.steady_state = steady_state
+        self.initial_state = initial_state
+        self.initial_covariance = initial_covariance
+        self.gain: Optional[np.ndarray] = None
+        if steady_state:
+            self.gain, _ = steady_state_gain(self.A, self.C, self.Q, self.R)
+        self.initialized: bool = False
+        self.reset()
+
+    @property
+    def measurement_shape(self) -> Tuple[int, ...]:
+        channels = () if self.channels is None else (self.channels,)
+        return channels + (self.num_outputs,)
+
+    def update(
+        self,
+        value: InputType
+    ) -> np.ndarray:
+        y = np.asarray(value, dtype=float)
+        if self.num_outputs == 1 and y.shape == self.measurement_shape[:-1]:
+            y = y[..., None]
+        y = np.broadcast_to(y, self.measurement_shape)
+        if not self.initialized:
+            self.x = np.linalg.lstsq(self.C, y.T, rcond=None)[0].T.copy()
+            self.initialized = True
+
+        if self.steady_state:
+            K = self.gain
+        else:
+            CP = self.C @ self.P
+            K = np.linalg.solve(CP @ self.C.T + self.R, CP).T
+            corrected = self.P - K @ CP
+            self.P = self.A @ (0.5 * (corrected + corrected.T)) @ self.A.T + self.Q
+
+        x = self.x + (y - self.x @ self.C.T) @ K.T
+        self.x = x @ self.A.T
+        return x
+
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        if self.num_outputs == 1 and values.ndim == len(self.measurement_shape):
+            values = values[..., None, :]
+        output = np.empty(self.measurement_shape[:-1] + (self.num_states, values.shape[-1]))
+        for n in range(values.shape[-1]):
+            output[..., n] = self.update(values[..., n])
+        return output
+
+    def reset(self) -> None:
+        channels = () if self.channels is None else (self.channels,)
+        if self.initial_state is not None:
+            self.x = np.array(np.broadcast_to(self.initial_state, channels + (self.num_states,)), dtype=float)
+            self.initialized = True
+        else:
+            self.x = np.zeros(channels + (self.num_states,))
+            self.initialized = False
+        if self.steady_state:
+            self.P = steady_state_gain(self.A, self.C, self.Q, self.R)[1]
+        elif self.initial_covariance is not None:
+            self.P = np.array(self.initial_covariance, dtype=float).reshape(self.A.shape)
+        else:
+            self.P = np.eye(self.num_states)
+
+    @property
+    def is_initialized(self) -> bool:
+        return self.initialized
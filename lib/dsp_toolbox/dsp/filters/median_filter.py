@@ -1,3 +1,9 @@
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from dsp_toolbox.dsp.types import (
     InputType,
     OutputType,
@@ -6,31 +12,141 @@ from dsp_toolbox.dsp.types import (
 from dsp_toolbox.dsp.filters.filter import BaseFilter
 
 
+# scales the median absolute deviation to a standard deviation for normal data
+MAD_SCALE = 1.4826
+
+
 class MedianFilter(BaseFilter[InputType, OutputType]):
+    """
+    Sliding window median over the last window_size samples
+
+    The window is kept both in arrival order and in a sorted list, so each update is a
+    binary search insert and delete instead of a full sort, and any rank is O(1) to
+    read. The searches are O(log window_size) comparisons, but inserting into and
+    deleting from the list shift the elements after the position, so an update is
+    O(window_size) overall. The shift is a single memmove of pointers, which for
+    windows of a few thousand samples costs less than the pointer chasing of an
+    indexable skiplist or the lazy deletions of two heaps in Python, and unlike two
+    heaps the sorted list gives the ranks median_deviation needs.
+    Until the window fills, the median of the samples so far is returned. For an even
+    count this is the upper of the two middle samples.
+
+    With outlier_threshold set the filter acts as a Hampel filter: a sample passes
+    through unchanged unless it is more than outlier_threshold scaled median absolute
+    deviations from the window median, in which case it is replaced by the median.
+    """
+    state_attributes = ("window", "sorted_window")
+
     def __init__(
         self,
-        window_size
+        window_size,
+        outlier_threshold: Optional[float] = None
     ) -> None:
         super().__init__()
         self.window_size = window_size
-        self.buffer = []
+        self.outlier_threshold = outlier_threshold
+        self.window = deque()
+        self.sorted_window = []
         self.initialized: bool = True
         self.reset()
-    
+
     def update(
         self,
         value: T
     ) -> T:
-        self.buffer.append(value)
-        if len(self.buffer) > self.window_size:
-            self.buffer.pop(0)
-    
-        sorted_buffer = sorted(self.buffer)
-        median_index = len(sorted_buffer) // 2
-        return sorted_buffer[median_index]
-    
+        window = self.window
+        sorted_window = self.sorted_window
+        window.append(value)
+        insort(sorted_window, value)
+        if len(window) > self.window_size:
+            del sorted_window[bisect_left(sorted_window, window.popleft())]
+
+        median = sorted_window[len(sorted_window) // 2]
+        if self.outlier_threshold is None:
+            return median
+        if abs(value - median) > self.outlier_threshold * MAD_SCALE * self.median_deviation():
+            return median
+        return value
+
+    def median_deviation(self) -> T:
+        """
+        Median absolute deviation of the window from its median, in O(log window_size)
+        reads of the sorted window
+
+        The deviations below and above the median form two ascending sequences read
+        straight off the sorted window, so the median deviation is their k-th smallest
+        element, found by binary search over how many come from each side.
+        """
+        values = self.sorted_window
+        count = len(values)
+        middle = count // 2
+        median = values[middle]
+        num_below = middle
+        num_above = count - middle
+        below = lambda i: median - values[middle - 1 - i]
+        above = lambda j: values[middle + j] - median
+
+        k = count // 2
+        low = max(0, k + 1 - num_above)
+        high = min(k + 1, num_below)
+        while True:
+            i = (low + high) // 2
+            j = k + 1 - i
+            if i < num_below and j > 0 and above(j - 1) > below(i):
+                low = i + 1
+            elif i > 0 and j < num_above and below(i - 1) > above(j):
+                high = i - 1
+            else:
+                break
+        candidates = []
+        if i > 0:
+            candidates.append(below(i - 1))
+        if j > 0:
+            candidates.append(above(j - 1))
+        return max(candidates)
+
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        """
+        Filter a block of samples, continuing from and updating the current window
+
+        Gives exactly the outputs of calling update on each sample. Full windows are
+        evaluated together over a strided view of the block.
+        """
+        values = np.asarray(values, dtype=float)
+        num_partial = min(len(values), max(0, self.window_size - 1 - len(self.window)))
+        output = np.empty(len(values))
+        for n in range(num_partial):
+            output[n] = self.update(values[n])
+        if num_partial == len(values):
+            return output
+
+        history = np.fromiter(self.window, float, len(self.window))[len(self.window) - self.window_size + 1:]
+        signal = np.concatenate([history, values[num_partial:]])
+        windows = sliding_window_view(signal, self.window_size)
+        rank = self.window_size // 2
+        chunk = max(1, 2 ** 20 // self.window_size)
+        for start in range(0, len(windows), chunk):
+            block = windows[start:start + chunk]
+            median = np.partition(block, rank, axis=1)[:, rank]
+            result = output[num_partial + start:num_partial + start + len(block)]
+            if self.outlier_threshold is None:
+                result[:] = median
+                continue
+            deviation = np.partition(np.abs(block - median[:, None]), rank, axis=1)[:, rank]
+            latest = block[:, -1]
+            outlier = np.abs(latest - median) > self.outlier_threshold * MAD_SCALE * deviation
+            result[:] = np.where(outlier, median, latest)
+
+        self.window = deque(signal[-self.window_size:].tolist())
+        self.sorted_window = sorted(self.window)
+        return output
+
     def reset(self):
-        self.buffer = []
+        self.window = deque()
+        self.sorted_window = []
 
     @property
     def is_initialized(self) -> bool:
@@ -0,0 +1,127 @@
+from math import gcd
+from typing import Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin
+
+from dsp_toolbox.dsp.types import (
+    InputType,
+    OutputType,
+    T
+)
+from dsp_toolbox.dsp.filters.filter import BaseFilter
+
+
+def anti_alias_taps(
+    up: int,
+    down: int,
+    zero_crossings: int = 10
+) -> np.ndarray:
+    """
+    Kaiser windowed sinc low-pass at the lower of the two Nyquist rates, scaled by up
+    to make up for the inserted zeros, the same design as scipy resample_poly
+    """
+    max_rate = max(up, down)
+    if max_rate == 1:
+        return np.ones(1)
+    return firwin(2 * zero_crossings * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+
+
+class Resampler(BaseFilter[InputType, OutputType]):
+    """
+    Rational rate change by up / down through an FIR anti-alias filter
+
+    Equivalent to inserting up - 1 zeros after each sample, filtering with taps and
+    keeping every down-th sample, but as a polyphase filter: each output is a dot
+    product of the recent inputs with one of up sub-filters, and outputs that would be
+    discarded are never computed. Output m lines up with input m * down / up.
+
+    Blocks may have any length; the input history and the phase of the next output
+    carry over, so streaming a signal in pieces gives the same outputs as processing
+    it at once. The history starts out filled with the first value. process returns
+    however many outputs the block completes, update the outputs for a single sample.
+    With channels set, inputs are shaped (channels, num_samples).
+    """
+    state_attributes = ("buffer", "position", "initialized")
+
+    def __init__(
+        self,
+        up: int,
+        down: int,
+        taps: Optional[np.ndarray] = None,
+        channels: Optional[int] = None,
+        zero_crossings: int = 10
+    ) -> None:
+        super().__init__()
+        divisor = gcd(up, down)
+        self.up = up // divisor
+        self.down = down // divisor
+        self.taps = np.asarray(
+            taps if taps is not None else anti_alias_taps(self.up, self.down, zero_crossings),
+            dtype=float
+        )
+        self.channels = channels
+        self.num_phase_taps = -(-len(self.taps) // self.up)
+        padded = np.zeros(self.num_phase_taps * self.up)
+        padded[:len(self.taps)] = self.taps
+        # row p holds taps p, p + up, ..., reversed to dot with oldest-first windows
+        self.phases = padded.reshape(self.num_phase_taps, self.up).T[:, ::-1].copy()
+        self.initialized: bool = False
+        self.reset()
+
+    def update(
+        self,
+        value: T
+    ) -> np.ndarray:
+        return self.process(np.asarray(value, dtype=float)[..., None])
+
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        num_samples = values.shape[-1]
+        if num_samples == 0:
+            return np.empty(values.shape)
+        if not self.initialized:
+            self.buffer[...] = values[..., :1]
+            self.initialized = True
+
+        # position is the upsampled index of the next output relative to this block
+        end = num_samples * self.up
+        num_outputs = max(0, -(-(end - self.position) // self.down))
+        signal = np.concatenate([self.buffer, values], axis=-1)
+        windows = sliding_window_view(signal, self.num_phase_taps, axis=-1)
+        output = np.empty(values.shape[:-1] + (num_outputs,))
+        # outputs up apart share a phase and are down inputs apart
+        for first in range(min(self.up, num_outputs)):
+            index, phase = divmod(self.position + first * self.down, self.up)
+            count = len(range(first, num_outputs, self.up))
+            rows = windows[..., index:index + (count - 1) * self.down + 1:self.down, :]
+            output[..., first::self.up] = rows @ self.phases[phase]
+
+        self.position += num_outputs * self.down - end
+        self.buffer = signal[..., signal.shape[-1] - self.buffer.shape[-1]:].copy()
+        return output
+
+    def reset(self) -> None:
+        channels = () if self.channels is None else (self.channels,)
+        self.buffer = np.zeros(channels + (self.num_phase_taps - 1,))
+        self.position = 0
+        self.initialized = False
+
+    @property
+    def is_initialized(self) -> bool:
+        return self.initialized
+
+
+class Decimator(Resampler):
+    """Anti-alias filtering and downsampling by an integer factor"""
+    def __init__(
+        self,
+        factor: int,
+        taps: Optional[np.ndarray] = None,
+        channels: Optional[int] = None,
+        zero_crossings: int = 10
+    ) -> None:
+        super().__init__(1, factor, taps=taps, channels=channels, zero_crossings=zero_crossings)
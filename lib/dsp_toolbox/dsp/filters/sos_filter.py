@@ -0,0 +1,190 @@
+from enum import IntEnum, unique
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+import numpy as np
+from scipy.signal import butter, cheby1, cheby2, sosfilt, sosfilt_zi
+
+from dsp_toolbox.dsp.types import (
+    FrequencyType,
+    InputType,
+    OutputType,
+    T
+)
+from dsp_toolbox.dsp.filters.filter import BaseFilter
+
+
+@unique
+class Design(IntEnum):
+    BUTTERWORTH = 0
+    CHEBYSHEV1 = 1
+    CHEBYSHEV2 = 2
+
+
+@unique
+class Response(IntEnum):
+    LOWPASS = 0
+    HIGHPASS = 1
+    BANDPASS = 2
+    BANDSTOP = 3
+
+
+RESPONSE_TYPES = {
+    Response.LOWPASS: "lowpass",
+    Response.HIGHPASS: "highpass",
+    Response.BANDPASS: "bandpass",
+    Response.BANDSTOP: "bandstop",
+}
+
+
+@lru_cache(maxsize=256)
+def _design(
+    design: Design,
+    order: int,
+    cutoff: Union[float, tuple],
+    sample_rate: float,
+    response: Response,
+    ripple: Optional[float]
+) -> np.ndarray:
+    btype = RESPONSE_TYPES[response]
+    if design == Design.BUTTERWORTH:
+        sos = butter(order, cutoff, btype=btype, output="sos", fs=sample_rate)
+    elif design == Design.CHEBYSHEV1:
+        sos = cheby1(order, ripple, cutoff, btype=btype, output="sos", fs=sample_rate)
+    else:
+        sos = cheby2(order, ripple, cutoff, btype=btype, output="sos", fs=sample_rate)
+    sos.flags.writeable = False
+    return sos
+
+
+def design_sos(
+    design: Design,
+    order: int,
+    cutoff: Union[FrequencyType, Sequence[FrequencyType]],
+    sample_rate: FrequencyType,
+    response: Response = Response.LOWPASS,
+    ripple: Optional[float] = None
+) -> np.ndarray:
+    """
+    Second-order sections of a digital filter, cutoff and sample_rate in Hz
+
+    Band filters take a (low, high) cutoff pair. ripple is the passband ripple in dB
+    for CHEBYSHEV1 and the stopband attenuation in dB for CHEBYSHEV2. Designs are
+    cached by specification and returned read-only, so hundreds of filters built from
+    the same spec run the design once.
+    """
+    if design != Design.BUTTERWORTH and ripple is None:
+        raise ValueError("Chebyshev designs need a ripple in dB")
+    if np.ndim(cutoff):
+        cutoff = tuple(float(f) for f in cutoff)
+    else:
+        cutoff = float(cutoff)
+    return _design(
+        Design(design),
+        int(order),
+        cutoff,
+        float(sample_rate),
+        Response(response),
+        None if ripple is None else float(ripple)
+    )
+
+
+class SOSFilter(BaseFilter[InputType, OutputType]):
+    """
+    Cascade of biquads in transposed direct form II, each section [b0 b1 b2 a0 a1 a2]
+    with a0 = 1, as returned by design_sos or scipy with output="sos"
+
+    The state starts out settled on the first value. With channels set, each update
+    takes a (channels,) vector and blocks are shaped (channels, num_samples), all
+    channels sharing the same sections.
+    """
+    state_attributes = ("zi", "initialized")
+
+    def __init__(
+        self,
+        sos: np.ndarray,
+        channels: Optional[int] = None
+    ) -> None:
+        super().__init__()
+        self.sos = np.array(sos, dtype=float)
+        self.channels = channels
+        self.initialized: bool = False
+        self.reset()
+
+    @classmethod
+    def butterworth(
+        cls,
+        order: int,
+        cutoff: Union[FrequencyType, Sequence[FrequencyType]],
+        sample_rate: FrequencyType,
+        response: Response = Response.LOWPASS,
+        channels: Optional[int] = None
+    ) -> "SOSFilter":
+        return cls(design_sos(Design.BUTTERWORTH, order, cutoff, sample_rate, response), channels)
+
+    @classmethod
+    def chebyshev(
+        cls,
+        order: int,
+        cutoff: Union[FrequencyType, Sequence[FrequencyType]],
+        sample_rate: FrequencyType,
+        ripple: float,
+        response: Response = Response.LOWPASS,
+        design: Design = Design.CHEBYSHEV1,
+        channels: Optional[int] = None
+    ) -> "SOSFilter":
+        return cls(design_sos(design, order, cutoff, sample_rate, response, ripple), channels)
+
+    @property
+    def num_sections(self) -> int:
+        return len(self.sos)
+
+    def initialize(self, value: T) -> None:
+        value = np.asarray(value, dtype=float)
+        if self.channels is not None:
+            value = np.broadcast_to(value, (self.channels,))
+        steady_state = sosfilt_zi(self.sos).reshape((self.num_sections,) + (1,) * value.ndim + (2,))
+        self.zi = steady_state * value[..., None]
+        self.initialized = True
+
+    def update(
+        self,
+        value: T
+    ) -> T:
+        if not self.initialized:
+            self.initialize(value)
+        x = value
+        for section, z in zip(self.sos, self.zi):
+            b0, b1, b2, _, a1, a2 = section
+            y = b0 * x + z[..., 0]
+            z[..., 0] = b1 * x - a1 * y + z[..., 1]
+            z[..., 1] = b2 * x - a2 * y
+            x = y
+        return x
+
+    def process(
+        self,
+        values: np.ndarray
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        if values.shape[-1] == 0:
+            return np.empty(values.shape)
+        if not self.initialized:
+            self.initialize(values[..., 0])
+        output, self.zi = sosfilt(self.sos, values, axis=-1, zi=self.zi)
+        return output
+
+    def to_sos(self) -> Optional[np.ndarray]:
+        return self.sos
+
+    @property
+    def starts_settled(self) -> bool:
+        return True
+
+    def reset(self) -> None:
+        channels = () if self.channels is None else (self.channels,)
+        self.zi = np.zeros((self.num_sections,) + channels + (2,))
+        self.initialized = False
+
+    @property
+    def is_initialized(self) -> bool:
+        return self.initialized
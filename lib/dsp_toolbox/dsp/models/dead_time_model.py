@@ -0,0 +1,90 @@
+from typing import Optional, Union
+import numpy as np
+
+from dsp_toolbox.dsp.types import T, InputType
+from dsp_toolbox.dsp.models.model import BaseModel
+from dsp_toolbox.dsp.models.history import BaseHistory
+from dsp_toolbox.dsp.snapshot import Snapshotable
+
+
+class DelayLine(Snapshotable):
+    """
+    Fixed-length delay over a circular buffer. Each push stores the new sample and
+    returns the one pushed delay_samples calls earlier in O(1).
+
+    Pushing (N,) arrays delays N loops at once, and delay_samples may be an (N,) array
+    of per-loop delays. Before the line has filled, initial_value is returned.
+    """
+    state_attributes = ("buffer", "index")
+
+    def __init__(
+        self,
+        delay_samples: Union[int, np.ndarray],
+        initial_value: T = 0.0,
+        num_loops: Optional[int] = None
+    ) -> None:
+        self.delay_samples = np.asarray(delay_samples, dtype=int)
+        if np.any(self.delay_samples < 0):
+            raise ValueError("Delay must be nonnegative")
+        self.length = int(np.max(self.delay_samples)) + 1
+        self.loops: Optional[np.ndarray] = None
+        if self.delay_samples.ndim:
+            if num_loops is None:
+                num_loops = self.delay_samples.size
+            self.loops = np.arange(num_loops)
+        shape = (self.length,) if num_loops is None else (self.length, num_loops)
+        self.initial_value = initial_value
+        self.buffer = np.empty(shape)
+        self.index = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.buffer[:] = self.initial_value
+        self.index = 0
+
+    def push(self, value: T) -> T:
+        if self.buffer.ndim == 1 and np.ndim(value):
+            self.buffer = np.repeat(self.buffer[:, None], np.size(value), axis=1)
+        self.buffer[self.index] = value
+        read_index = (self.index - self.delay_samples) % self.length
+        if self.loops is not None:
+            delayed = self.buffer[read_index, self.loops]
+        else:
+            delayed = self.buffer[read_index].copy()
+        self.index = (self.index + 1) % self.length
+        return delayed
+
+
+class DeadTimeModel(BaseModel):
+    """
+    Delays the input of any model by dead_time seconds, e.g. a FirstOrderModel
+    becomes a first-order-plus-dead-time plant.
+
+    Memory is proportional to the delay, not the simulation horizon. dead_time may
+    be an (N,) array to give each loop of a batched model its own delay.
+    """
+    state_attributes = ("model", "delay_line")
+
+    def __init__(
+        self,
+        model: BaseModel,
+        dead_time: Union[float, np.ndarray],
+        delta_t: Optional[float] = None,
+        initial_input: T = 0.0,
+        num_loops: Optional[int] = None
+    ) -> None:
+        super().__init__()
+        self.model = model
+        self.dead_time = dead_time
+        if delta_t is None:
+            delta_t = getattr(model, "delta_t", 0.01)
+        self.delta_t = delta_t
+        delay_samples = np.rint(np.asarray(dead_time) / self.delta_t).astype(int)
+        self.delay_line = DelayLine(delay_samples, initial_input, num_loops)
+
+    @property
+    def pv(self) -> BaseHistory:
+        return self.model.pv
+
+    def update(self, u: InputType) -> T:
+        return self.model.update(self.delay_line.push(u))
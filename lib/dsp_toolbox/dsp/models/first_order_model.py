@@ -1,21 +1,60 @@
-from typing import Iterable
-from dsp_toolbox.dsp.models.model import BaseModel
+from typing import Optional
+import numpy as np
+
+from dsp_toolbox.dsp.models.model import BaseModel, Discretization
+from dsp_toolbox.dsp.models.history import BaseHistory
+from dsp_toolbox.dsp.models.state_space_model import StateSpaceModel
 
 class FirstOrderModel(BaseModel):
+    state_attributes = ("pv", "state_space")
+
     def __init__(
         self, gain: float,
         time_constant: float,
-        initial_condition: float = 0.0
+        initial_condition: float = 0.0,
+        delta_t: float = 0.01,
+        discretization: Discretization = Discretization.EULER,
+        horizon: Optional[int] = None,
+        max_history: Optional[int] = None
     ) -> None:
         super().__init__()
         self.gain = gain
         self.time_constant = time_constant
         self.initial_condition = initial_condition
+        self.delta_t = delta_t
+        self.discretization = discretization
         
-        self.pv: Iterable = [self.initial_condition]
+        self.pv: BaseHistory = self.create_history(
+            self.initial_condition,
+            horizon=horizon,
+            max_history=max_history
+        )
+        self.state_space: Optional[StateSpaceModel] = None
+        if self.discretization == Discretization.ZERO_ORDER_HOLD:
+            self.state_space = self.to_state_space()
+
+    def to_state_space(self) -> StateSpaceModel:
+        """
+        Equivalent exactly discretized model y' = (-y + gain * u) / time_constant
+        """
+        if np.ndim(self.gain) or np.ndim(self.time_constant):
+            raise ValueError("State space form requires scalar model parameters")
+        return StateSpaceModel(
+            A=[[-1.0 / self.time_constant]],
+            B=[[self.gain / self.time_constant]],
+            C=[[1.0]],
+            dt=self.delta_t,
+            initial_state=[self.initial_condition],
+            max_history=1
+        )
 
     def update(self, u: float) -> float:
-        delta_t = 0.01
-        dy_dt = (-self.pv[-1] + self.gain * u) / self.time_constant
-        self.pv.append(self.pv[-1] + dy_dt * delta_t)
-        return self.pv[-1]
+        if self.state_space is not None:
+            y = self.state_space.update(u)
+            self.pv.append(y)
+            return y
+        y = self.pv[-1]
+        dy_dt = (-y + self.gain * u) / self.time_constant
+        y = y + dy_dt * self.delta_t
+        self.pv.append(y)
+        return y
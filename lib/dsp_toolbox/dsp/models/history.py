@@ -0,0 +1,164 @@
+from abc import ABC, abstractmethod
+from typing import Iterator
+import numpy as np
+
+from dsp_toolbox.dsp.types import T
+from dsp_toolbox.dsp.snapshot import Snapshotable
+
+
+class BaseHistory(ABC, Snapshotable):
+    """
+    Array-backed record of model samples. Behaves like the list it replaces for
+    append, len and indexing, while view() exposes the samples as a NumPy array
+    without copying.
+    """
+
+    @abstractmethod
+    def append(self, value: T) -> None:
+        raise RuntimeError("Can't call base history")
+
+    @abstractmethod
+    def view(self) -> np.ndarray:
+        raise RuntimeError("Can't call base history")
+
+    def reserve(self, capacity: int) -> None:
+        """Hint that capacity samples are about to be stored"""
+        pass
+
+    def __getitem__(self, index):
+        # the latest sample is read every step, so it is kept at hand
+        if type(index) is int and index == -1:
+            return self.last
+        return self.view()[index]
+
+    def __len__(self) -> int:
+        return len(self.view())
+
+    def __iter__(self) -> Iterator:
+        return iter(self.view())
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return np.asarray(self.view(), dtype=dtype)
+
+    def set_state(self, state) -> None:
+        super().set_state(state)
+        self.scalar = self.buffer.ndim == 1
+        last = self.view()[-1]
+        self.last = last.item() if self.scalar else last
+
+    @staticmethod
+    def allocate(length: int, item_shape: tuple) -> np.ndarray:
+        return np.empty((length,) + item_shape)
+
+    @staticmethod
+    def expand(samples: np.ndarray, item_shape: tuple) -> np.ndarray:
+        """Pad stored samples with unit axes so they broadcast to item_shape"""
+        padding = (1,) * (len(item_shape) - samples.ndim + 1)
+        return samples.reshape(samples.shape[:1] + padding + samples.shape[1:])
+
+
+class ArrayHistory(BaseHistory):
+    """
+    Unbounded history in a preallocated buffer that grows geometrically when full
+
+    Samples may be scalars or arrays (batched loops). If a later sample has a larger
+    shape than the stored ones, e.g. a scalar initial condition followed by (N,) batched
+    outputs, the stored samples are broadcast to the new shape.
+    """
+    state_attributes = ("buffer", "size")
+
+    def __init__(
+        self,
+        initial_value: T,
+        capacity: int = 1024,
+        growth_factor: float = 2.0
+    ) -> None:
+        self.growth_factor = growth_factor
+        self.size = 0
+        self.buffer = self.allocate(max(capacity, 1), np.shape(initial_value))
+        self.scalar = self.buffer.ndim == 1
+        self.append(initial_value)
+
+    def append(self, value: T) -> None:
+        size = self.size
+        # floats into a scalar buffer with room left are the per-step hot path
+        if self.scalar and isinstance(value, float) and size < len(self.buffer):
+            self.buffer[size] = value
+            self.size = size + 1
+            self.last = value
+            return
+        if np.shape(value) != self.buffer.shape[1:]:
+            self.reshape(np.shape(value))
+        if size == len(self.buffer):
+            self.reserve(int(np.ceil(size * self.growth_factor)))
+        self.buffer[size] = value
+        self.size = size + 1
+        self.last = value if self.scalar else self.buffer[size]
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= len(self.buffer):
+            return
+        buffer = self.allocate(capacity, self.buffer.shape[1:])
+        buffer[:self.size] = self.buffer[:self.size]
+        self.buffer = buffer
+
+    def reshape(self, item_shape: tuple) -> None:
+        item_shape = np.broadcast_shapes(self.buffer.shape[1:], item_shape)
+        buffer = self.allocate(len(self.buffer), item_shape)
+        buffer[:self.size] = self.expand(self.buffer[:self.size], item_shape)
+        self.buffer = buffer
+        self.scalar = self.buffer.ndim == 1
+
+    def get_state(self) -> dict:
+        # only the stored samples, not the spare capacity, but still all of them, so
+        # each snapshot costs O(len(self))
+        return {"buffer": self.view().copy(), "size": self.size}
+
+    def view(self) -> np.ndarray:
+        return self.buffer[:self.size]
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class RingHistory(BaseHistory):
+    """
+    Bounded history that keeps only the last max_samples samples
+
+    Every sample is written twice, max_samples apart, so the retained samples are
+    always a contiguous slice of the buffer and view() stays zero-copy.
+    """
+    state_attributes = ("buffer", "size", "index")
+
+    def __init__(
+        self,
+        initial_value: T,
+        max_samples: int
+    ) -> None:
+        self.max_samples = max_samples
+        self.size = 0
+        self.index = 0
+        self.buffer = self.allocate(2 * max_samples, np.shape(initial_value))
+        self.scalar = self.buffer.ndim == 1
+        self.append(initial_value)
+
+    def append(self, value: T) -> None:
+        if not (self.scalar and isinstance(value, float)) and np.shape(value) != self.buffer.shape[1:]:
+            item_shape = np.broadcast_shapes(self.buffer.shape[1:], np.shape(value))
+            buffer = self.allocate(len(self.buffer), item_shape)
+            buffer[:] = self.expand(self.buffer, item_shape)
+            self.buffer = buffer
+            self.scalar = self.buffer.ndim == 1
+        index = self.index
+        self.buffer[index] = value
+        self.buffer[index + self.max_samples] = value
+        self.index = (index + 1) % self.max_samples
+        self.size = min(self.size + 1, self.max_samples)
+        self.last = value if self.scalar else self.buffer[index]
+
+    def view(self) -> np.ndarray:
+        end = self.index + self.max_samples
+        return self.buffer[end - self.size:end]
+
+    def __len__(self) -> int:
+        return self.size
@@ -1,10 +1,37 @@
 from abc import ABC
+from enum import IntEnum, unique
+from typing import Optional
 import numpy as np
 
 from dsp_toolbox.dsp.types import T, InputType
+from dsp_toolbox.dsp.models.history import BaseHistory, ArrayHistory, RingHistory
+from dsp_toolbox.dsp.snapshot import Snapshotable
 
 
-class BaseModel(ABC):
+@unique
+class Discretization(IntEnum):
+    EULER = 0
+    ZERO_ORDER_HOLD = 1
+
+
+class BaseModel(ABC, Snapshotable):
     def update(self, u: InputType) -> np.array:
         raise RuntimeError("BaseModel not implemented")
-    
\ No newline at end of file
+
+    @staticmethod
+    def create_history(
+        initial_condition: T,
+        horizon: Optional[int] = None,
+        max_history: Optional[int] = None
+    ) -> BaseHistory:
+        """
+        Storage for the process value history
+
+        With max_history set, only the last max_history samples are kept in a ring buffer.
+        Otherwise the buffer is preallocated for horizon updates and grows as needed.
+        """
+        if max_history is not None:
+            return RingHistory(initial_condition, max_history)
+        if horizon is not None:
+            return ArrayHistory(initial_condition, capacity=horizon + 1)
+        return ArrayHistory(initial_condition)
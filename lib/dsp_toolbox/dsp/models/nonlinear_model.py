@@ -0,0 +1,138 @@
+from enum import IntEnum, unique
+from typing import Callable, Optional
+import numpy as np
+
+from dsp_toolbox.dsp.types import T, InputType, TimeType
+from dsp_toolbox.dsp.models.model import BaseModel
+from dsp_toolbox.dsp.models.history import BaseHistory
+
+
+@unique
+class Integrator(IntEnum):
+    RK4 = 0
+    RK45 = 1
+
+
+# Dormand-Prince 5(4) tableau
+DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+)
+DP_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+DP_E = DP_B - np.array(
+    [5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40]
+)
+
+
+class NonlinearModel(BaseModel):
+    """
+    Plant x' = f(x, u, t) with the input held constant over each delta_t sample
+
+    f must be vectorized: x has shape (num_states,) or (num_states, N) for N batched
+    plants with a (N,) input, and f returns the derivative with the same shape as x.
+    The process value is output(x), x[0] by default.
+
+    RK4 takes a fixed number of substeps per sample. RK45 is an adaptive Dormand-Prince
+    integrator whose step size carries over between samples: it subdivides a sample only
+    while the local error exceeds the tolerance and takes a single step per sample when
+    the plant is settled. Batched plants share one step size, chosen by the worst error.
+    """
+    state_attributes = ("x", "t", "step_size", "pv")
+
+    def __init__(
+        self,
+        f: Callable[[np.ndarray, InputType, TimeType], np.ndarray],
+        initial_state: np.ndarray,
+        delta_t: float = 0.01,
+        integrator: Integrator = Integrator.RK4,
+        output: Optional[Callable[[np.ndarray], T]] = None,
+        substeps: int = 1,
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
+        horizon: Optional[int] = None,
+        max_history: Optional[int] = None
+    ) -> None:
+        super().__init__()
+        self.f = f
+        self.delta_t = delta_t
+        self.integrator = integrator
+        self.output = output if output is not None else (lambda x: x[0])
+        self.substeps = substeps
+        self.rtol = rtol
+        self.atol = atol
+        self.x = np.array(initial_state, dtype=float)
+        self.t = 0.0
+        self.step_size = delta_t
+        self.pv: BaseHistory = self.create_history(
+            self.output(self.x),
+            horizon=horizon,
+            max_history=max_history
+        )
+
+    def update(self, u: InputType) -> T:
+        if np.ndim(u) and self.x.ndim == 1:
+            self.x = np.repeat(self.x[:, None], np.size(u), axis=1)
+        if self.integrator == Integrator.RK45:
+            self.x = self.rk45(self.x, u, self.t, self.delta_t)
+        else:
+            h = self.delta_t / self.substeps
+            for i in range(self.substeps):
+                self.x = self.rk4(self.x, u, self.t + i * h, h)
+        self.t += self.delta_t
+        y = self.output(self.x)
+        self.pv.append(y)
+        return y
+
+    def rk4(
+        self,
+        x: np.ndarray,
+        u: InputType,
+        t: TimeType,
+        h: float
+    ) -> np.ndarray:
+        f = self.f
+        k1 = f(x, u, t)
+        k2 = f(x + 0.5 * h * k1, u, t + 0.5 * h)
+        k3 = f(x + 0.5 * h * k2, u, t + 0.5 * h)
+        k4 = f(x + h * k3, u, t + h)
+        return x + (h / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    def rk45(
+        self,
+        x: np.ndarray,
+        u: InputType,
+        t: TimeType,
+        duration: float
+    ) -> np.ndarray:
+        f = self.f
+        end = t + duration
+        k = [f(x, u, t)] + [None] * 6
+        while end - t > 1e-12 * duration:
+            h = min(self.step_size, end - t)
+            for stage in range(1, 6):
+                dx = sum(a * k[j] for j, a in enumerate(DP_A[stage]))
+                k[stage] = f(x + h * dx, u, t + DP_C[stage] * h)
+            x_new = x + h * sum(b * k[j] for j, b in enumerate(DP_B[:6]))
+            k[6] = f(x_new, u, t + h)
+            error = h * sum(e * k[j] for j, e in enumerate(DP_E))
+            scale = self.atol + self.rtol * np.maximum(np.abs(x), np.abs(x_new))
+            # RMS over the states of each plant, then the worst plant
+            error_norm = np.max(np.sqrt(np.mean(np.square(error / scale), axis=0)))
+
+            factor = 5.0 if error_norm == 0 else min(5.0, max(0.2, 0.9 * error_norm ** -0.2))
+            if error_norm <= 1.0:
+                x = x_new
+                t += h
+                k[0] = k[6]
+                if h == self.step_size or factor < 1.0:
+                    self.step_size = min(h * factor, self.delta_t)
+            else:
+                self.step_size = h * factor
+                if self.step_size < 1e-12 * self.delta_t:
+                    raise RuntimeError("RK45 step size underflow")
+        return x
@@ -1,29 +1,102 @@
-from typing import Iterable
-from dsp_toolbox.dsp.models.model import BaseModel
+from enum import IntEnum, unique
+from typing import Optional
+import numpy as np
+
+from dsp_toolbox.dsp.models.model import BaseModel, Discretization
+from dsp_toolbox.dsp.models.history import BaseHistory
+from dsp_toolbox.dsp.models.state_space_model import StateSpaceModel
+
+
+@unique
+class SecondOrderForm(IntEnum):
+    LAGGED_ERROR = 0
+    OSCILLATOR = 1
 
 
 class SecondOrderModel(BaseModel):
+    """
+    Second order plant, in one of two forms that have different dynamics
+
+    LAGGED_ERROR, the default, is the original recursion
+    y[k + 1] = y[k] + delta_t * (wn^2 * e[k] - 2 * damping_ratio * wn * e[k - 1])
+    on the error e = u - y. It has no continuous-time equivalent, so it only supports
+    EULER; as delta_t shrinks it tends to a first order lag with rate
+    wn^2 - 2 * damping_ratio * wn and does not overshoot.
+
+    OSCILLATOR is the textbook y'' + 2 * damping_ratio * wn * y' + wn^2 * y = wn^2 * u
+    with states y and y', which overshoots for damping_ratio < 1. EULER integrates it
+    with forward Euler and ZERO_ORDER_HOLD discretizes it exactly, so the
+    discretization only changes the accuracy, not the plant.
+    """
+    state_attributes = ("pv", "prev_error", "velocity", "state_space")
+
     def __init__(
         self,
         natural_frequency: float,
         damping_ratio: float,
-        initial_condition: float = 0.0
+        initial_condition: float = 0.0,
+        delta_t: float = 0.01,
+        discretization: Discretization = Discretization.EULER,
+        horizon: Optional[int] = None,
+        max_history: Optional[int] = None,
+        form: SecondOrderForm = SecondOrderForm.LAGGED_ERROR
     ) -> None:
         super().__init__()
         self.natural_frequency = natural_frequency
         self.damping_ratio = damping_ratio
         self.initial_condition = initial_condition
+        self.delta_t = delta_t
+        self.discretization = discretization
+        self.form = form
         self.prev_error = 0.0
-        
-        self.pv: Iterable = [self.initial_condition]
+        self.velocity = 0.0
+        if form == SecondOrderForm.LAGGED_ERROR and discretization != Discretization.EULER:
+            raise ValueError("The lagged error form only supports Euler discretization, use OSCILLATOR")
+
+        self.pv: BaseHistory = self.create_history(
+            self.initial_condition,
+            horizon=horizon,
+            max_history=max_history
+        )
+        self.state_space: Optional[StateSpaceModel] = None
+        if self.discretization == Discretization.ZERO_ORDER_HOLD:
+            self.state_space = self.to_state_space()
+
+    def to_state_space(self) -> StateSpaceModel:
+        """
+        Exactly discretized OSCILLATOR form, starting at rest at initial_condition
+        """
+        if np.ndim(self.natural_frequency) or np.ndim(self.damping_ratio):
+            raise ValueError("State space form requires scalar model parameters")
+        wn = self.natural_frequency
+        return StateSpaceModel(
+            A=[[0.0, 1.0], [-wn ** 2, -2 * self.damping_ratio * wn]],
+            B=[[0.0], [wn ** 2]],
+            C=[[1.0, 0.0]],
+            dt=self.delta_t,
+            initial_state=[self.initial_condition, 0.0],
+            max_history=1
+        )
 
     def update(self, u: float) -> float:
-        delta_t = 0.01
-        error = u - self.pv[-1]
+        if self.state_space is not None:
+            y = self.state_space.update(u)
+            self.pv.append(y)
+            return y
+        y = self.pv[-1]
+        if self.form == SecondOrderForm.OSCILLATOR:
+            wn = self.natural_frequency
+            acceleration = wn ** 2 * (u - y) - 2 * self.damping_ratio * wn * self.velocity
+            y = y + self.velocity * self.delta_t
+            self.velocity = self.velocity + acceleration * self.delta_t
+            self.pv.append(y)
+            return y
+        error = u - y
         dy_dt = (
             -2 * self.damping_ratio * self.natural_frequency * self.prev_error
-            - self.natural_frequency ** 2 * (self.pv[-1] - u)
+            - self.natural_frequency ** 2 * (y - u)
         )
         self.prev_error = error
-        self.pv.append(self.pv[-1] + dy_dt * delta_t)
-        return self.pv[-1]
+        y = y + dy_dt * self.delta_t
+        self.pv.append(y)
+        return y
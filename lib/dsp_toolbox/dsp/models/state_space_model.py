@@ -0,0 +1,109 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+from scipy.linalg import expm
+
+from dsp_toolbox.dsp.types import T, InputType
+from dsp_toolbox.dsp.models.model import BaseModel
+
+
+@lru_cache(maxsize=256)
+def _zero_order_hold(
+    a_bytes: bytes,
+    b_bytes: bytes,
+    num_states: int,
+    num_inputs: int,
+    dt: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    A = np.frombuffer(a_bytes).reshape(num_states, num_states)
+    B = np.frombuffer(b_bytes).reshape(num_states, num_inputs)
+    block = np.zeros((num_states + num_inputs, num_states + num_inputs))
+    block[:num_states, :num_states] = A * dt
+    block[:num_states, num_states:] = B * dt
+    exponential = expm(block)
+    Ad = exponential[:num_states, :num_states]
+    Bd = exponential[:num_states, num_states:]
+    Ad.flags.writeable = False
+    Bd.flags.writeable = False
+    return Ad, Bd
+
+
+def discretize(A: np.ndarray, B: np.ndarray, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zero-order-hold discretization of x' = Ax + Bu with sample time dt
+
+    The matrix exponential is cached by (A, B, dt), so models sharing a plant and
+    sample time compute it once. The returned matrices are read-only.
+    """
+    A = np.atleast_2d(np.asarray(A, dtype=float))
+    B = np.asarray(B, dtype=float).reshape(A.shape[0], -1)
+    return _zero_order_hold(A.tobytes(), B.tobytes(), A.shape[0], B.shape[1], float(dt))
+
+
+class StateSpaceModel(BaseModel):
+    """
+    Linear time-invariant plant x' = Ax + Bu, y = Cx + Du, discretized exactly with a
+    zero-order hold on the input, so each update is one small matrix-vector product.
+
+    Single-input single-output models take and return scalars, or (N,) arrays to step
+    N plants sharing the same matrices at once. Otherwise u is an (m,) or (m, N) array.
+    """
+    state_attributes = ("x", "pv")
+
+    def __init__(
+        self,
+        A: np.ndarray,
+        B: np.ndarray,
+        C: np.ndarray,
+        D: Optional[np.ndarray] = None,
+        dt: float = 0.01,
+        initial_state: Optional[np.ndarray] = None,
+        horizon: Optional[int] = None,
+        max_history: Optional[int] = None
+    ) -> None:
+        super().__init__()
+        self.A = np.atleast_2d(np.asarray(A, dtype=float))
+        self.B = np.asarray(B, dtype=float).reshape(self.A.shape[0], -1)
+        self.C = np.asarray(C, dtype=float).reshape(-1, self.A.shape[0])
+        if D is None:
+            D = np.zeros((self.C.shape[0], self.B.shape[1]))
+        self.D = np.asarray(D, dtype=float).reshape(self.C.shape[0], self.B.shape[1])
+        self.dt = dt
+        self.Ad, self.Bd = discretize(self.A, self.B, self.dt)
+        self.is_siso = self.B.shape[1] == 1 and self.C.shape[0] == 1
+
+        if initial_state is None:
+            initial_state = np.zeros(self.num_states)
+        self.x = np.array(initial_state, dtype=float)
+        self.pv = self.create_history(
+            self.output(self.x),
+            horizon=horizon,
+            max_history=max_history
+        )
+
+    @property
+    def delta_t(self) -> float:
+        return self.dt
+
+    @property
+    def num_states(self) -> int:
+        return self.A.shape[0]
+
+    def output(self, x: np.ndarray, u: InputType = 0.0) -> T:
+        if self.is_siso:
+            return self.C[0] @ x + self.D[0, 0] * u
+        return self.C @ x + self.D @ np.broadcast_to(u, (self.D.shape[1],) + x.shape[1:])
+
+    def update(self, u: InputType) -> T:
+        if self.is_siso:
+            if np.ndim(u) and self.x.ndim == 1:
+                self.x = np.repeat(self.x[:, None], np.size(u), axis=1)
+            self.x = self.Ad @ self.x + np.multiply.outer(self.Bd[:, 0], u)
+        else:
+            u = np.asarray(u)
+            if u.ndim > 1 and self.x.ndim == 1:
+                self.x = np.repeat(self.x[:, None], u.shape[1], axis=1)
+            self.x = self.Ad @ self.x + self.Bd @ u
+        y = self.output(self.x, u)
+        self.pv.append(y)
+        return y
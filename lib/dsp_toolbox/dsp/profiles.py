@@ -0,0 +1,81 @@
+from typing import Optional, Sequence
+import numpy as np
+from scipy.signal import max_len_seq
+
+from dsp_toolbox.dsp.types import T, TimeType
+
+
+def freeze(profile: np.ndarray) -> np.ndarray:
+    """Mark a profile read-only so it can be shared between runs without copies"""
+    profile.flags.writeable = False
+    return profile
+
+
+def sample_times(num_samples: int, delta_t: TimeType) -> np.ndarray:
+    return np.arange(num_samples) * delta_t
+
+
+def step(
+    num_samples: int,
+    delta_t: TimeType,
+    step_time: TimeType,
+    final: T,
+    initial: T = 0.0
+) -> np.ndarray:
+    """initial until step_time, final afterwards"""
+    t = sample_times(num_samples, delta_t)
+    return freeze(np.where(t < step_time, float(initial), float(final)))
+
+
+def ramp(
+    num_samples: int,
+    delta_t: TimeType,
+    start_time: TimeType,
+    end_time: TimeType,
+    final: T,
+    initial: T = 0.0
+) -> np.ndarray:
+    """initial until start_time, then linear to final at end_time, and held"""
+    t = sample_times(num_samples, delta_t)
+    return freeze(np.interp(t, [start_time, end_time], [initial, final]))
+
+
+def piecewise(
+    num_samples: int,
+    delta_t: TimeType,
+    times: Sequence[TimeType],
+    values: Sequence[T],
+    interpolate: bool = False
+) -> np.ndarray:
+    """
+    Segments starting at times with the given values, held until the next breakpoint,
+    or linearly interpolated between breakpoints if interpolate is set. Samples before
+    the first breakpoint take the first value.
+    """
+    t = sample_times(num_samples, delta_t)
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if interpolate:
+        return freeze(np.interp(t, times, values))
+    index = np.searchsorted(times, t, side="right") - 1
+    return freeze(values[np.clip(index, 0, len(values) - 1)])
+
+
+def prbs(
+    num_samples: int,
+    amplitude: T,
+    order: int = 7,
+    hold_samples: int = 1,
+    offset: T = 0.0,
+    state: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Pseudo-random binary sequence switching between offset +/- amplitude
+
+    Uses a maximum length sequence from an order-bit shift register, each bit held
+    for hold_samples samples, repeating as needed to fill num_samples.
+    """
+    num_bits = -(-num_samples // hold_samples)
+    bits, _ = max_len_seq(order, state=state, length=num_bits)
+    levels = np.where(bits.astype(bool), amplitude, -amplitude) + offset
+    return freeze(np.repeat(levels, hold_samples)[:num_samples].astype(float))
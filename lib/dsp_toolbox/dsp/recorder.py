@@ -0,0 +1,94 @@
+from typing import Optional
+import numpy as np
+
+from dsp_toolbox.dsp.types import T
+from dsp_toolbox.dsp.controllers.controller import BaseController
+from dsp_toolbox.dsp.snapshot import Snapshotable
+
+
+RECORDED_SIGNALS = ("pv", "u", "setpoint", "error", "p_term", "i_term", "d_term")
+
+
+class SignalRecorder(Snapshotable):
+    """
+    Records the closed-loop signals of a simulation into preallocated columns of a
+    NumPy structured array, one field per signal in RECORDED_SIGNALS.
+
+    Only every decimation-th step is kept. num_samples steps are preallocated; the
+    columns grow geometrically when a run goes beyond them, e.g. a consecutive or
+    resumed run, so no step is dropped. With num_loops set, each field is a
+    (samples, num_loops) column for batched simulations. PID terms are read from
+    the controller's p_term, i_term and d_term and are NaN for controllers without them.
+    """
+    state_attributes = ("data", "size", "step")
+
+    def __init__(
+        self,
+        num_samples: int,
+        decimation: int = 1,
+        num_loops: Optional[int] = None,
+        growth_factor: float = 2.0
+    ) -> None:
+        self.decimation = decimation
+        self.num_loops = num_loops
+        self.growth_factor = growth_factor
+        self.data = self.allocate(-(-num_samples // decimation))
+        self.columns = [self.data[name] for name in RECORDED_SIGNALS]
+        self.reset()
+
+    def allocate(self, capacity: int) -> np.ndarray:
+        shape = (capacity,) if self.num_loops is None else (capacity, self.num_loops)
+        return np.full(shape, np.nan, dtype=[(name, float) for name in RECORDED_SIGNALS])
+
+    def reserve(self, num_steps: int) -> None:
+        """Make room for the samples of num_steps more steps"""
+        self.grow(-(-(self.step + num_steps) // self.decimation))
+
+    def grow(self, capacity: int) -> None:
+        if capacity <= len(self.data):
+            return
+        data = self.allocate(capacity)
+        data[:self.size] = self.data[:self.size]
+        self.data = data
+        self.columns = [self.data[name] for name in RECORDED_SIGNALS]
+
+    def reset(self) -> None:
+        self.size = 0
+        self.step = 0
+
+    def set_state(self, state: dict) -> None:
+        super().set_state(state)
+        self.columns = [self.data[name] for name in RECORDED_SIGNALS]
+
+    def record(
+        self,
+        pv: T,
+        u: T,
+        setpoint: T,
+        controller: BaseController
+    ) -> None:
+        step = self.step
+        self.step += 1
+        if step % self.decimation:
+            return
+        index = self.size
+        if index == len(self.data):
+            self.grow(int(np.ceil(max(index, 1) * self.growth_factor)))
+        pv_col, u_col, setpoint_col, error_col, p_col, i_col, d_col = self.columns
+        pv_col[index] = pv
+        u_col[index] = u
+        setpoint_col[index] = setpoint
+        error_col[index] = setpoint - pv
+        p_col[index] = getattr(controller, "p_term", np.nan)
+        i_col[index] = getattr(controller, "i_term", np.nan)
+        d_col[index] = getattr(controller, "d_term", np.nan)
+        self.size += 1
+
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
+
+    def __getitem__(self, signal: str) -> np.ndarray:
+        return self.view()[signal]
+
+    def __len__(self) -> int:
+        return self.size
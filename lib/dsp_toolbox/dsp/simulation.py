@@ -1,24 +1,321 @@
-from typing import Iterable
+import copy
+from typing import Iterable, Iterator, Optional, Sequence
+import numpy as np
 
 from dsp_toolbox.dsp.types import T
 from dsp_toolbox.dsp.controllers.controller import BaseController
 from dsp_toolbox.dsp.models.model import BaseModel
+from dsp_toolbox.dsp.models.history import BaseHistory
+from dsp_toolbox.dsp.recorder import SignalRecorder
+from dsp_toolbox.dsp.stop_criteria import BaseStopCriterion
+from dsp_toolbox.dsp.snapshot import Snapshotable, save_snapshot
+
+class Simulation(Snapshotable):
+    """
+    Closed loop of a controller and a model
+
+    setpoint is a constant or a precomputed profile with one value per step (see
+    dsp_toolbox.dsp.profiles). disturbance is a load profile added to the model input
+    and noise a measurement profile added to the process value the controller sees.
+    Profiles are indexed by elapsed_steps, the steps taken since construction, so
+    consecutive or resumed runs continue along them. The controller is stepped on the
+    same simulated time base, elapsed_steps * delta_t, never the wall clock, so a run
+    resumed in another process continues exactly.
+
+    With checkpoint_path and checkpoint_interval set, a snapshot of the controller,
+    model and recorder state is written every checkpoint_interval steps. Loading it
+    into an identically constructed simulation resumes the run. Each checkpoint
+    pickles the whole state, including every sample of an unbounded model history, so
+    its cost grows with the run; bound the history with max_history for long runs.
+    """
+    # setpoints with at least this many dimensions are profiles over time
+    profile_ndim = 1
+    state_attributes = ("controller", "model", "recorder", "elapsed_steps")
 
-class Simulation:
     def __init__(
         self,
         controller: BaseController,
         model: BaseModel,
-        setpoint: T
+        setpoint: T,
+        recorder: Optional[SignalRecorder] = None,
+        delta_t: Optional[float] = None,
+        disturbance: Optional[np.ndarray] = None,
+        noise: Optional[np.ndarray] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: Optional[int] = None
     ) -> None:
         self.controller = controller
         self.model = model
         self.setpoint = setpoint
-        
-    def run(self, num_samples: int) -> Iterable:
+        self.recorder = recorder
+        self.disturbance = disturbance
+        self.noise = noise
+        if delta_t is None:
+            delta_t = getattr(model, "delta_t", 0.01)
+        self.delta_t = delta_t
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.elapsed_steps = 0
+        self.num_steps = 0
+        self.stop_reason: Optional[BaseStopCriterion] = None
+
+    def run(
+        self,
+        num_samples: int,
+        criteria: Sequence[BaseStopCriterion] = ()
+    ) -> Iterable:
+        for _ in self.iter(num_samples, criteria=criteria):
+            pass
+
+        history = self.model.pv
+        if isinstance(history, BaseHistory):
+            return history.view()
+        return history
+
+    def iter(
+        self,
+        num_samples: int,
+        chunk_size: Optional[int] = None,
+        criteria: Sequence[BaseStopCriterion] = ()
+    ) -> Iterator:
+        """
+        Step the simulation incrementally, yielding each new process value, or arrays of
+        up to chunk_size of them
+
+        The run ends after num_samples steps or as soon as any of the criteria is met,
+        in which case stop_reason holds the criterion that fired. Criteria see the time
+        since the start of the run on a delta_t time base.
+        """
+        setpoint_profile = self.check_profiles(num_samples)
+        setpoint = self.setpoint
+        disturbance = self.disturbance
+        noise = self.noise
+        history = self.model.pv
+        if isinstance(history, BaseHistory):
+            history.reserve(len(history) + num_samples)
+        for criterion in criteria:
+            criterion.reset()
+        self.num_steps = 0
+        self.stop_reason = None
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.reserve(num_samples)
+        controller = self.controller
+        update_model = self.model.update
+        delta_t = self.delta_t
+        checkpointing = bool(self.checkpoint_interval)
+        chunk = None if chunk_size is None else np.empty(chunk_size)
+        filled = 0
+
+        start = self.elapsed_steps
         for i in range(num_samples):
-            u = self.controller.update(self.model.pv[i], self.setpoint)
-            self.model.update(u)
-            
-        return self.model.pv
-            
+            k = start + i
+            if setpoint_profile is not None:
+                setpoint = setpoint_profile[..., k]
+            pv = history[-1]
+            measurement = pv if noise is None else pv + noise[..., k]
+            u = controller(measurement, setpoint, k * delta_t)
+            if recorder is not None:
+                recorder.record(pv, u, setpoint, controller)
+            y = update_model(u if disturbance is None else u + disturbance[..., k])
+            self.num_steps = i + 1
+            if checkpointing:
+                self.step_completed()
+            else:
+                self.elapsed_steps += 1
+
+            stop = bool(criteria) and self.check_criteria(
+                criteria, y, setpoint, self.num_steps * self.delta_t
+            )
+            if chunk is None:
+                yield y
+            else:
+                chunk[filled] = y
+                filled += 1
+                if filled == chunk_size:
+                    yield chunk.copy()
+                    filled = 0
+            if stop:
+                break
+
+        if filled:
+            yield chunk[:filled].copy()
+
+    def check_profiles(self, num_samples: int) -> Optional[np.ndarray]:
+        """
+        Validate that every profile covers num_samples steps, returning the setpoint
+        profile or None for a constant setpoint
+        """
+        setpoint_profile = None
+        if np.ndim(self.setpoint) >= self.profile_ndim:
+            setpoint_profile = self.setpoint
+        for name, profile in (
+            ("setpoint", setpoint_profile),
+            ("disturbance", self.disturbance),
+            ("noise", self.noise)
+        ):
+            if profile is not None and np.shape(profile)[-1] < self.elapsed_steps + num_samples:
+                raise ValueError(f"{name} profile ends before step {self.elapsed_steps + num_samples}")
+        return setpoint_profile
+
+    def step_completed(self) -> None:
+        self.elapsed_steps += 1
+        interval = self.checkpoint_interval
+        if interval and self.elapsed_steps % interval == 0:
+            save_snapshot(self.checkpoint_path, self)
+
+    def fork(self) -> "Simulation":
+        """
+        Independent copy of the simulation in its current state, e.g. to branch several
+        what-if runs off one warmed-up plant
+        """
+        return copy.deepcopy(self)
+
+    def check_criteria(
+        self,
+        criteria: Sequence[BaseStopCriterion],
+        pv: T,
+        setpoint: T,
+        t: float
+    ) -> bool:
+        for criterion in criteria:
+            if criterion(pv, setpoint, t):
+                self.stop_reason = criterion
+                return True
+        return False
+
+
+class BatchSimulation(Simulation):
+    """
+    Simulates num_loops independent closed loops at once.
+
+    The controller gains and limits and the model parameters are NumPy arrays of shape
+    (num_loops,) (scalars are broadcast), so every time step advances all of the loops
+    with one vectorized operation. The controller is stepped on a fixed time base of
+    delta_t rather than the wall clock, by default the model's own sample time.
+
+    A (num_loops,) setpoint gives each loop its own constant setpoint, while setpoint
+    profiles are (1, num_samples) or (num_loops, num_samples). Disturbance and noise
+    profiles are (num_samples,), shared by all loops without copying, or
+    (num_loops, num_samples).
+    """
+    profile_ndim = 2
+
+    def __init__(
+        self,
+        controller: BaseController,
+        model: BaseModel,
+        setpoint: T,
+        num_loops: int,
+        delta_t: Optional[float] = None,
+        recorder: Optional[SignalRecorder] = None,
+        disturbance: Optional[np.ndarray] = None,
+        noise: Optional[np.ndarray] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: Optional[int] = None
+    ) -> None:
+        super().__init__(
+            controller,
+            model,
+            setpoint,
+            recorder,
+            delta_t,
+            disturbance,
+            noise,
+            checkpoint_path,
+            checkpoint_interval
+        )
+        self.num_loops = num_loops
+        self.done = np.zeros(num_loops, dtype=bool)
+        self.stop_steps = np.full(num_loops, -1)
+
+    def run(
+        self,
+        num_samples: int,
+        criteria: Sequence[BaseStopCriterion] = ()
+    ) -> np.ndarray:
+        """
+        Returns a (num_loops, num_steps) array of the process value fed to the
+        controller at each step
+        """
+        trajectory = np.empty((self.num_loops, num_samples))
+        pv = np.broadcast_to(self.model.pv[-1], (self.num_loops,))
+        for i, next_pv in enumerate(self.iter(num_samples, criteria=criteria)):
+            trajectory[:, i] = pv
+            pv = next_pv
+
+        return trajectory[:, :self.num_steps]
+
+    def iter(
+        self,
+        num_samples: int,
+        chunk_size: Optional[int] = None,
+        criteria: Sequence[BaseStopCriterion] = ()
+    ) -> Iterator:
+        """
+        Step all loops incrementally, yielding (num_loops,) process values, or
+        (num_loops, chunk) arrays of up to chunk_size steps
+
+        A loop is done once any criterion holds for it; stop_steps records the step at
+        which that happened. The run ends when every loop is done.
+        """
+        setpoint_profile = self.check_profiles(num_samples)
+        setpoint = self.setpoint
+        disturbance = self.disturbance
+        noise = self.noise
+        for criterion in criteria:
+            criterion.reset()
+        self.num_steps = 0
+        self.done[:] = False
+        self.stop_steps[:] = -1
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.reserve(num_samples)
+        chunk = None if chunk_size is None else np.empty((self.num_loops, chunk_size))
+        filled = 0
+        pv = np.broadcast_to(self.model.pv[-1], (self.num_loops,))
+
+        start = self.elapsed_steps
+        for i in range(num_samples):
+            k = start + i
+            if setpoint_profile is not None:
+                setpoint = setpoint_profile[..., k]
+            measurement = pv if noise is None else pv + noise[..., k]
+            u = self.controller.update(measurement, setpoint, k * self.delta_t)
+            if recorder is not None:
+                recorder.record(pv, u, setpoint, self.controller)
+            y = self.model.update(u if disturbance is None else u + disturbance[..., k])
+            pv = np.broadcast_to(y, (self.num_loops,))
+            self.num_steps = i + 1
+            self.step_completed()
+
+            stop = bool(criteria) and self.check_criteria(
+                criteria, pv, setpoint, self.num_steps * self.delta_t
+            )
+            if chunk is None:
+                yield pv
+            else:
+                chunk[:, filled] = pv
+                filled += 1
+                if filled == chunk_size:
+                    yield chunk.copy()
+                    filled = 0
+            if stop:
+                break
+
+        if filled:
+            yield chunk[:, :filled].copy()
+
+    def check_criteria(
+        self,
+        criteria: Sequence[BaseStopCriterion],
+        pv: T,
+        setpoint: T,
+        t: float
+    ) -> bool:
+        finished = np.zeros(self.num_loops, dtype=bool)
+        for criterion in criteria:
+            finished |= criterion(pv, setpoint, t)
+        self.stop_steps[finished & ~self.done] = self.num_steps
+        self.done |= finished
+        return bool(self.done.all())
@@ -0,0 +1,65 @@
+import copy
+import os
+import pickle
+import zlib
+from typing import Any, Dict, Tuple
+
+
+class Snapshotable:
+    """
+    Mixin for objects whose runtime state can be captured and restored
+
+    Subclasses list the attributes that make up their state in state_attributes.
+    Attributes that are themselves Snapshotable are captured recursively, so e.g. a
+    model's history or a wrapped model are restored in place.
+    """
+    state_attributes: Tuple[str, ...] = ()
+
+    def get_state(self) -> Dict[str, Any]:
+        state = {}
+        for name in self.state_attributes:
+            value = getattr(self, name)
+            if isinstance(value, Snapshotable):
+                state[name] = value.get_state()
+            else:
+                state[name] = copy.deepcopy(value)
+        return state
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        for name in self.state_attributes:
+            current = getattr(self, name, None)
+            if isinstance(current, Snapshotable):
+                current.set_state(state[name])
+            else:
+                setattr(self, name, copy.deepcopy(state[name]))
+
+    def snapshot(self) -> bytes:
+        return dumps(self.get_state())
+
+    def restore(self, snapshot: bytes) -> None:
+        self.set_state(loads(snapshot))
+
+
+def dumps(state: Dict[str, Any]) -> bytes:
+    """Encode a state as compressed binary"""
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def loads(snapshot: bytes) -> Dict[str, Any]:
+    """
+    Decode a state written by dumps. Snapshots are pickles, only load trusted files.
+    """
+    return pickle.loads(zlib.decompress(snapshot))
+
+
+def save_snapshot(path: str, obj: Snapshotable) -> None:
+    """Write a snapshot atomically, so an interrupted write keeps the previous file"""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(obj.snapshot())
+    os.replace(temporary_path, path)
+
+
+def load_snapshot(path: str, obj: Snapshotable) -> None:
+    with open(path, "rb") as file:
+        obj.restore(file.read())
@@ -0,0 +1,110 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+from dsp_toolbox.dsp.types import T, TimeType
+
+
+class BaseStopCriterion(ABC):
+    """
+    Decides after each simulation step whether a run can end early
+
+    Criteria are evaluated elementwise, so with batched (N,) process values they
+    return an (N,) boolean array of loops that may stop.
+    """
+
+    @abstractmethod
+    def reset(self) -> None:
+        raise RuntimeError("Can't call base stop criterion")
+
+    @abstractmethod
+    def __call__(
+        self,
+        pv: T,
+        setpoint: T,
+        t: TimeType
+    ) -> bool:
+        raise RuntimeError("Can't call base stop criterion")
+
+
+class SettledCriterion(BaseStopCriterion):
+    """
+    Stops once the error has stayed within +/- band for duration seconds
+    """
+    def __init__(
+        self,
+        band: T,
+        duration: TimeType
+    ) -> None:
+        self.band = band
+        self.duration = duration
+        self.reset()
+
+    def reset(self) -> None:
+        self.entered_band = np.inf
+
+    def __call__(
+        self,
+        pv: T,
+        setpoint: T,
+        t: TimeType
+    ) -> bool:
+        in_band = np.abs(setpoint - pv) <= self.band
+        self.entered_band = np.where(in_band, np.minimum(self.entered_band, t), np.inf)
+        return t - self.entered_band >= self.duration
+
+
+class DivergedCriterion(BaseStopCriterion):
+    """
+    Stops as soon as the magnitude of the error exceeds bound
+    """
+    def __init__(
+        self,
+        bound: T
+    ) -> None:
+        self.bound = bound
+
+    def reset(self) -> None:
+        pass
+
+    def __call__(
+        self,
+        pv: T,
+        setpoint: T,
+        t: TimeType
+    ) -> bool:
+        return np.abs(setpoint - pv) > self.bound
+
+
+class OscillationCriterion(BaseStopCriterion):
+    """
+    Stops after num_crossings setpoint crossings, each preceded by an excursion of at
+    least min_amplitude from the setpoint
+    """
+    def __init__(
+        self,
+        num_crossings: int,
+        min_amplitude: T = 0.0
+    ) -> None:
+        self.num_crossings = num_crossings
+        self.min_amplitude = min_amplitude
+        self.reset()
+
+    def reset(self) -> None:
+        self.sign = 0.0
+        self.peak = 0.0
+        self.crossings = 0
+
+    def __call__(
+        self,
+        pv: T,
+        setpoint: T,
+        t: TimeType
+    ) -> bool:
+        error = setpoint - pv
+        sign = np.sign(error)
+        self.peak = np.maximum(self.peak, np.abs(error))
+        crossed = sign * self.sign < 0
+        self.crossings = self.crossings + (crossed & (self.peak >= self.min_amplitude))
+        self.peak = np.where(crossed, 0.0, self.peak)
+        self.sign = np.where(sign != 0, sign, self.sign)
+        return self.crossings >= self.num_crossings
@@ -2,6 +2,7 @@ from typing import Iterable
 import numpy as np
 
 from dsp_toolbox.dsp.types import T
+from dsp_toolbox.dsp.recorder import SignalRecorder
 
 
 def PIDCost(
@@ -16,9 +17,29 @@ def PIDCost(
     changes in output variable per controller step, and the initial controller output.
     
     J = sum((stp[i] - v[i])^2*t[i])*We + sum((command[i+1] - command[i])^2)*Wu + command[0]^2*Wu
+
+    Signals are summed along the first axis, so (samples, loops) arrays give one cost per loop.
     """
-    error_term = error_weight * np.sum(np.square(setpoint - process_value))
-    command_term = command_weight * np.sum(np.square(np.diff(output_value)))
+    error_term = error_weight * np.sum(np.square(setpoint - process_value), axis=0)
+    command_term = command_weight * np.sum(np.square(np.diff(output_value, axis=0)), axis=0)
     bias_term = command_weight * output_value[0]**2
     
-    return error_term + command_term + bias_term
\ No newline at end of file
+    return error_term + command_term + bias_term
+
+
+def RecordingCost(
+    error_weight: float,
+    command_weight: float,
+    recorder: SignalRecorder
+) -> float:
+    """
+    PIDCost evaluated on the signals of a recorded simulation, without rerunning it.
+    Decimated recordings are costed on the retained samples only.
+    """
+    return PIDCost(
+        error_weight=error_weight,
+        command_weight=command_weight,
+        setpoint=recorder["setpoint"],
+        process_value=recorder["pv"],
+        output_value=recorder["u"]
+    )
\ No newline at end of file
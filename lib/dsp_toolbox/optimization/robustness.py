@@ -0,0 +1,128 @@
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple, Type
+import numpy as np
+
+from dsp_toolbox.dsp.types import T, Limits, PIDGains
+from dsp_toolbox.dsp.controllers.pid import PIDController
+from dsp_toolbox.dsp.models.model import BaseModel
+from dsp_toolbox.dsp.recorder import SignalRecorder
+from dsp_toolbox.dsp.simulation import BatchSimulation
+from dsp_toolbox.optimization.cost import RecordingCost
+
+
+Sampler = Callable[[np.random.Generator, int], np.ndarray]
+
+
+def normal(mean: T, std: T) -> Sampler:
+    return lambda rng, size: rng.normal(mean, std, size)
+
+
+def uniform(low: T, high: T) -> Sampler:
+    return lambda rng, size: rng.uniform(low, high, size)
+
+
+def lognormal(median: T, sigma: T) -> Sampler:
+    """Strictly positive values, e.g. for time constants, with the given median"""
+    return lambda rng, size: median * rng.lognormal(0.0, sigma, size)
+
+
+class RobustnessReport(NamedTuple):
+    parameters: Dict[str, np.ndarray]
+    overshoot: np.ndarray
+    settling_time: np.ndarray
+    cost: np.ndarray
+    percentiles: Tuple[float, ...]
+    envelope: np.ndarray
+
+    def summary(self) -> Dict[str, np.ndarray]:
+        """Percentiles of each metric across the plant variants"""
+        return {
+            name: np.percentile(getattr(self, name), self.percentiles)
+            for name in ("overshoot", "settling_time", "cost")
+        }
+
+
+class RobustnessAnalysis:
+    """
+    Monte Carlo check of one set of PID gains against uncertain plant parameters
+
+    Each model parameter in distributions is sampled num_variants times; the remaining
+    model arguments come from model_kwargs. All variants are simulated as one batch
+    against the same controller and summarized by overshoot (percent of the step),
+    settling time (seconds until the error stays within settling_band of the step,
+    inf if it never does) and RecordingCost, along with percentile envelopes of the
+    process value over time.
+    """
+    def __init__(
+        self,
+        gains: PIDGains,
+        model_type: Type[BaseModel],
+        distributions: Dict[str, Sampler],
+        setpoint: T,
+        num_samples: int,
+        output_limits: Optional[Limits[T]] = None,
+        model_kwargs: Optional[dict] = None,
+        error_weight: float = 1.0,
+        command_weight: float = 0.0,
+        settling_band: float = 0.02,
+        percentiles: Sequence[float] = (5.0, 50.0, 95.0)
+    ) -> None:
+        self.gains = gains
+        self.model_type = model_type
+        self.distributions = distributions
+        self.setpoint = setpoint
+        self.num_samples = num_samples
+        self.output_limits = output_limits
+        self.model_kwargs = model_kwargs or {}
+        self.error_weight = error_weight
+        self.command_weight = command_weight
+        self.settling_band = settling_band
+        self.percentiles = tuple(percentiles)
+
+    def sample(
+        self,
+        num_variants: int,
+        seed: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        rng = np.random.default_rng(seed)
+        return {name: sampler(rng, num_variants) for name, sampler in self.distributions.items()}
+
+    def run(
+        self,
+        num_variants: int,
+        seed: Optional[int] = None
+    ) -> RobustnessReport:
+        parameters = self.sample(num_variants, seed)
+        model = self.model_type(**parameters, **self.model_kwargs)
+        recorder = SignalRecorder(self.num_samples, num_loops=num_variants)
+        simulation = BatchSimulation(
+            controller=PIDController(
+                kp=self.gains.Kp,
+                ki=self.gains.Ki,
+                kd=self.gains.Kd,
+                output_limits=self.output_limits
+            ),
+            model=model,
+            setpoint=self.setpoint,
+            num_loops=num_variants,
+            recorder=recorder
+        )
+        simulation.run(self.num_samples)
+
+        pv = recorder["pv"]
+        step = self.setpoint - pv[0]
+        step_size = np.where(step == 0, 1.0, np.abs(step))
+        overshoot = np.maximum(np.max((pv - pv[0]) * np.sign(step), axis=0) - np.abs(step), 0.0)
+
+        outside = np.abs(recorder["error"]) > self.settling_band * step_size
+        last_outside = self.num_samples - np.argmax(outside[::-1], axis=0)
+        settling_time = np.where(outside.any(axis=0), last_outside * simulation.delta_t, 0.0)
+        settling_time[outside[-1]] = np.inf
+
+        return RobustnessReport(
+            parameters=parameters,
+            overshoot=100.0 * overshoot / step_size,
+            settling_time=settling_time,
+            cost=RecordingCost(self.error_weight, self.command_weight, recorder),
+            percentiles=self.percentiles,
+            envelope=np.percentile(pv, self.percentiles, axis=1)
+        )
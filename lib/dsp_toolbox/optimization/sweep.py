@@ -0,0 +1,137 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional, Sequence, Tuple, Type
+import numpy as np
+
+from dsp_toolbox.dsp.types import T, Limits
+from dsp_toolbox.dsp.controllers.pid import PIDController
+from dsp_toolbox.dsp.models.model import BaseModel
+from dsp_toolbox.dsp.simulation import BatchSimulation
+from dsp_toolbox.dsp.stop_criteria import BaseStopCriterion
+
+
+GAIN_NAMES = ("kp", "ki", "kd")
+
+
+def simulate_chunk(
+    sweep: "ParameterSweep",
+    parameters: Dict[str, np.ndarray],
+    start: int,
+    shm_name: str,
+    shape: Tuple[int, ...]
+) -> int:
+    """
+    Worker task: simulate a chunk of points as one batch and write the rows into the
+    shared result array from index start
+    """
+    rows = sweep.evaluate(parameters)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        results = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        results[start:start + len(rows)] = rows
+        del results
+    finally:
+        shm.close()
+    return len(rows)
+
+
+class ParameterSweep:
+    """
+    Simulates a PIDController against a model for every point of a parameter set,
+    spread over a pool of worker processes.
+
+    Parameters are given as equal length arrays keyed by name: kp, ki and kd go to the
+    controller and every other key is passed to model_type together with model_kwargs.
+    Points are scheduled in chunks of chunk_size, each simulated as one BatchSimulation.
+    Workers write straight into a shared memory result array: the (num_samples,)
+    trajectory of each point, or the scalar returned for it by metric, which maps a
+    (points, num_samples) trajectory array to (points,) values. Loops stopped early by
+    criteria have their remaining samples set to NaN.
+    """
+    def __init__(
+        self,
+        model_type: Type[BaseModel],
+        setpoint: T,
+        num_samples: int,
+        output_limits: Optional[Limits[T]] = None,
+        model_kwargs: Optional[dict] = None,
+        metric: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        criteria: Sequence[BaseStopCriterion] = (),
+        chunk_size: int = 256,
+        max_workers: Optional[int] = None
+    ) -> None:
+        self.model_type = model_type
+        self.setpoint = setpoint
+        self.num_samples = num_samples
+        self.output_limits = output_limits
+        self.model_kwargs = model_kwargs or {}
+        self.metric = metric
+        self.criteria = criteria
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    @staticmethod
+    def grid(**axes: Sequence[T]) -> Dict[str, np.ndarray]:
+        """Cartesian product of the given axes as flat parameter arrays"""
+        mesh = np.meshgrid(*[np.asarray(axis, dtype=float) for axis in axes.values()], indexing="ij")
+        return {name: values.ravel() for name, values in zip(axes.keys(), mesh)}
+
+    def evaluate(self, parameters: Dict[str, np.ndarray]) -> np.ndarray:
+        """Simulate the given points in the current process as one batch"""
+        num_points = len(next(iter(parameters.values())))
+        gains = {name: parameters.get(name, 0.0) for name in GAIN_NAMES}
+        model_params = {k: v for k, v in parameters.items() if k not in GAIN_NAMES}
+        simulation = BatchSimulation(
+            controller=PIDController(output_limits=self.output_limits, **gains),
+            model=self.model_type(**model_params, **self.model_kwargs),
+            setpoint=self.setpoint,
+            num_loops=num_points
+        )
+        trajectory = np.full((num_points, self.num_samples), np.nan)
+        data = simulation.run(self.num_samples, criteria=self.criteria)
+        trajectory[:, :data.shape[1]] = data
+        stop_steps = np.where(simulation.stop_steps >= 0, simulation.stop_steps, self.num_samples)
+        trajectory[np.arange(self.num_samples) >= stop_steps[:, None]] = np.nan
+        if self.metric is not None:
+            return self.metric(trajectory)
+        return trajectory
+
+    def run(
+        self,
+        parameters: Dict[str, np.ndarray],
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> np.ndarray:
+        """
+        Evaluate every point, returning (points, num_samples) trajectories or (points,)
+        metrics. progress is called with (points done, total points) as chunks finish.
+        """
+        parameters = {k: np.asarray(v, dtype=float) for k, v in parameters.items()}
+        num_points = len(next(iter(parameters.values())))
+        shape = (num_points,) if self.metric is not None else (num_points, self.num_samples)
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+        try:
+            done = 0
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        simulate_chunk,
+                        self,
+                        {k: v[start:start + self.chunk_size] for k, v in parameters.items()},
+                        start,
+                        shm.name,
+                        shape
+                    )
+                    for start in range(0, num_points, self.chunk_size)
+                ]
+                for future in as_completed(futures):
+                    done += future.result()
+                    if progress is not None:
+                        progress(done, num_points)
+                    else:
+                        logging.info(f"Sweep progress: {done}/{num_points}")
+            results = np.ndarray(shape, dtype=float, buffer=shm.buf).copy()
+            return results
+        finally:
+            shm.close()
+            shm.unlink()
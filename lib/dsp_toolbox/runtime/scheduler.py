@@ -0,0 +1,178 @@
+import asyncio
+import inspect
+import math
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from dsp_toolbox.dsp.types import T, TimeType
+from dsp_toolbox.dsp.controllers.controller import BaseController
+from dsp_toolbox.dsp.filters.filter import BaseFilter
+
+
+Sensor = Callable[[], Union[T, Awaitable[T]]]
+Actuator = Callable[[T], Union[None, Awaitable[None]]]
+
+
+async def resolve(result):
+    """Await the result of a hook if it is awaitable, so hooks may be sync or async"""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+class LoopStats:
+    """
+    Timing of a control loop
+
+    Lateness is how long after its scheduled release a cycle started, jitter its
+    standard deviation. A deadline is missed when a cycle is still running at the next
+    release; the releases it overran are skipped rather than run back to back.
+    """
+    def __init__(self) -> None:
+        self.cycles = 0
+        self.misses = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+        self.max_duration = 0.0
+        self.lateness_sum = 0.0
+        self.lateness_square_sum = 0.0
+
+    def record(
+        self,
+        lateness: TimeType,
+        duration: TimeType,
+        skipped: int
+    ) -> None:
+        self.cycles += 1
+        self.misses += skipped > 0
+        self.skipped += skipped
+        self.max_lateness = max(self.max_lateness, lateness)
+        self.max_duration = max(self.max_duration, duration)
+        self.lateness_sum += lateness
+        self.lateness_square_sum += lateness * lateness
+
+    @property
+    def mean_lateness(self) -> TimeType:
+        return self.lateness_sum / self.cycles if self.cycles else 0.0
+
+    @property
+    def jitter(self) -> TimeType:
+        if not self.cycles:
+            return 0.0
+        variance = self.lateness_square_sum / self.cycles - self.mean_lateness ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "cycles": self.cycles,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "mean_lateness": self.mean_lateness,
+            "max_lateness": self.max_lateness,
+            "jitter": self.jitter,
+            "max_duration": self.max_duration,
+        }
+
+
+class ControlLoop:
+    """
+    sensor -> measurement_filter -> controller -> actuator, run every period seconds
+
+    sensor and actuator may be plain functions or coroutines, so I/O can await without
+    blocking the other loops. setpoint is a value or a function of the loop time. The
+    controller gets the scheduled time of each cycle, counted from the loop start, so
+    its time steps are exact whatever the wake-up jitter.
+    """
+    def __init__(
+        self,
+        period: TimeType,
+        sensor: Sensor,
+        controller: BaseController,
+        actuator: Actuator,
+        setpoint: Union[T, Callable[[TimeType], T]],
+        measurement_filter: Optional[BaseFilter] = None,
+        name: Optional[str] = None,
+        offset: TimeType = 0.0
+    ) -> None:
+        self.period = period
+        self.sensor = sensor
+        self.controller = controller
+        self.actuator = actuator
+        self.setpoint = setpoint
+        self.measurement_filter = measurement_filter
+        self.name = name
+        self.offset = offset
+        self.stats = LoopStats()
+
+    async def step(self, t: TimeType) -> None:
+        value = await resolve(self.sensor())
+        if self.measurement_filter is not None:
+            value = self.measurement_filter.update(value)
+        setpoint = self.setpoint(t) if callable(self.setpoint) else self.setpoint
+        output = self.controller(value, setpoint, t)
+        await resolve(self.actuator(output))
+
+
+class Scheduler:
+    """
+    Runs many control loops, each at its own rate, on one asyncio event loop
+
+    Releases are absolute: cycle k of a loop is due at start + offset + k * period, so
+    timing errors never accumulate into drift.
+    """
+    def __init__(
+        self,
+        loops: Sequence[ControlLoop] = ()
+    ) -> None:
+        self.loops: List[ControlLoop] = list(loops)
+        self.running = False
+
+    def add(self, loop: ControlLoop) -> ControlLoop:
+        self.loops.append(loop)
+        return loop
+
+    def stop(self) -> None:
+        """Let every loop finish its current cycle and return from run"""
+        self.running = False
+
+    async def run(self, duration: Optional[TimeType] = None) -> None:
+        self.running = True
+        event_loop = asyncio.get_running_loop()
+        start = event_loop.time()
+        tasks = [asyncio.create_task(self.run_loop(loop, start)) for loop in self.loops]
+        try:
+            if duration is not None:
+                if tasks:
+                    await asyncio.wait(tasks, timeout=duration, return_when=asyncio.FIRST_EXCEPTION)
+                else:
+                    await asyncio.sleep(duration)
+                self.stop()
+            await asyncio.gather(*tasks)
+        finally:
+            self.running = False
+            for task in tasks:
+                task.cancel()
+
+    async def run_loop(
+        self,
+        loop: ControlLoop,
+        start: TimeType
+    ) -> None:
+        event_loop = asyncio.get_running_loop()
+        first_release = start + loop.offset
+        cycle = 0
+        while self.running:
+            release = first_release + cycle * loop.period
+            delay = release - event_loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if not self.running:
+                break
+            began = event_loop.time()
+            await loop.step(cycle * loop.period)
+            finished = event_loop.time()
+
+            next_cycle = cycle + 1
+            overrun = finished - (first_release + next_cycle * loop.period)
+            skipped = int(overrun // loop.period) + 1 if overrun > 0 else 0
+            loop.stats.record(began - release, finished - began, skipped)
+            cycle = next_cycle + skipped
@@ -0,0 +1,151 @@
+import copy
+import numpy as np
+from scipy.optimize import lsq_linear
+
+from dsp_toolbox.dsp.types import PIDGains
+from dsp_toolbox.dsp.controllers.gain_scheduled_pid import GainScheduledPID
+from dsp_toolbox.dsp.controllers.mpc import ModelPredictiveController
+from dsp_toolbox.dsp.controllers.pid import PIDController
+from dsp_toolbox.dsp.controllers.pid_bank import PIDControllerBank
+from dsp_toolbox.dsp.models.state_space_model import StateSpaceModel
+
+
+def test_pid_bank():
+    rng = np.random.default_rng(0)
+    num_loops = 50
+    kp = rng.uniform(0.5, 2.0, num_loops)
+    ki = rng.uniform(0.0, 1.0, num_loops)
+    kd = rng.uniform(0.0, 0.1, num_loops)
+    high = rng.uniform(5.0, 20.0, num_loops)
+    bank = PIDControllerBank(kp, ki, kd, (0.0, high), num_loops, i_limits=(-5.0, 5.0))
+    controllers = [
+        PIDController(kp[i], ki[i], kd[i], (0.0, high[i]), i_limits=(-5.0, 5.0)) for i in range(num_loops)
+    ]
+
+    for k in range(50):
+        value = 3.0 * rng.normal(size=num_loops)
+        t = 0.1 * k
+        if k == 20:
+            bank.reset([1, 2])
+            controllers[1].reset()
+            controllers[2].reset()
+        expected = [controller(value[i], 5.0, t) for i, controller in enumerate(controllers)]
+        np.testing.assert_array_equal(bank(value, 5.0, t), expected)
+    np.testing.assert_array_equal(bank.i_term, [controller.i_term for controller in controllers])
+
+    held = bank.output.copy()
+    state = bank.get_state()
+    bank.enabled[:10] = False
+    output = bank(np.zeros(num_loops), 5.0, 10.0)
+    np.testing.assert_array_equal(output[:10], held[:10])
+    np.testing.assert_array_equal(bank.last_time[:10], state["last_time"][:10])
+    assert (bank.last_time[10:] == 10.0).all()
+
+    bank.set_state(state)
+    assert bank.enabled.all()
+
+
+def test_fixed_rate_pid():
+    sample_time, kp, ki, kd, antiwindup_gain, derivative_filter = 0.1, 2.0, 1.5, 0.3, 0.8, 0.05
+    low, high = -3.0, 4.0
+    controller = PIDController(
+        kp, ki, kd, (low, high),
+        sample_time=sample_time,
+        derivative_filter=derivative_filter,
+        antiwindup_gain=antiwindup_gain
+    )
+    measurements = np.random.default_rng(1).normal(size=300)
+    setpoint = 1.0
+
+    # positional form with back-calculation, primed so the first step has no derivative kick
+    error_prev = setpoint - measurements[0]
+    command_prev = kp * error_prev
+    saturated_prev = command_prev
+    integral = 0.0
+    derivative_prev = 0.0
+    for measurement in measurements:
+        error = setpoint - measurement
+        integral += ki * error * sample_time + antiwindup_gain * (saturated_prev - command_prev) * sample_time
+        derivative = (error - error_prev + derivative_filter * derivative_prev) / (sample_time + derivative_filter)
+        command_prev = kp * error + integral + kd * derivative
+        saturated_prev = min(max(command_prev, low), high)
+        error_prev = error
+        derivative_prev = derivative
+
+        output = controller(measurement, setpoint, t=-1.0)
+        assert abs(output - saturated_prev) < 1e-12
+        assert abs(controller.i_term - integral) < 1e-12
+
+    # with the error unchanged, a new kp moves nothing and a new ki only the next increment
+    controller(0.5, setpoint)
+    unchanged = copy.deepcopy(controller)
+    controller.set_kp(4.0)
+    controller.set_ki(0.1)
+    difference = controller(0.5, setpoint) - unchanged(0.5, setpoint)
+    assert abs(difference - (0.1 - ki) * 0.5 * sample_time) < 1e-12
+
+
+def test_gain_scheduled_pid():
+    breakpoints = [0.0, 10.0, 20.0, 40.0]
+    gains = [PIDGains(1.0, 0.5, 0.0), PIDGains(2.0, 1.0, 0.1), PIDGains(4.0, 0.2, 0.0), PIDGains(1.0, 2.0, 0.0)]
+    scheduled = GainScheduledPID(breakpoints, gains, PIDController(1.0, 0.5, 0.0, (-100.0, 100.0)))
+
+    x = np.linspace(-5.0, 50.0, 1001)
+    expected = np.stack([np.interp(x, breakpoints, column) for column in zip(*gains)], axis=1)
+    np.testing.assert_allclose([scheduled.lookup(value) for value in x], expected, atol=1e-12)
+    np.testing.assert_allclose(np.transpose(scheduled.lookup(x)), expected, atol=1e-12)
+
+    for k in range(10):
+        scheduled(5.0, 8.0, t=0.1 * k)
+    pid = scheduled.controller
+    integral_term = pid.ki * pid.integrated_error
+    scheduled.schedule(30.0)
+    assert abs(pid.ki - 1.1) < 1e-12
+    assert abs(pid.ki * pid.integrated_error - integral_term) < 1e-12
+
+    values = np.array([1.0, 5.0, 15.0, 25.0, 45.0])
+    batched = GainScheduledPID(breakpoints, gains, PIDControllerBank(1.0, 0.5, 0.0, (-100.0, 100.0), len(values)))
+    singles = [GainScheduledPID(breakpoints, gains, PIDController(1.0, 0.5, 0.0, (-100.0, 100.0))) for _ in values]
+    for k in range(5):
+        outputs = batched(values + k, 30.0, t=0.1 * k)
+        expected = [single(value + k, 30.0, t=0.1 * k) for single, value in zip(singles, values)]
+        np.testing.assert_allclose(outputs, expected, rtol=1e-12)
+
+
+def test_mpc():
+    plant = StateSpaceModel([[0.0, 1.0], [-2.0, -0.5]], [0.0, 1.0], [1.0, 0.0], dt=0.05)
+    controller = ModelPredictiveController.from_model(plant, 20, 10.0, 0.1, (-3.0, 3.0))
+    hessian = controller.hessian
+    cholesky = np.linalg.cholesky(hessian)
+
+    constrained = 0
+    for _ in range(300):
+        x = plant.x.copy()
+        features = np.concatenate((x, [1.0], controller.last_input))
+        u = controller(x, 1.0)
+        unconstrained = controller.gain @ features
+        if np.all(np.abs(unconstrained) <= 3.0):
+            assert u == unconstrained[0]
+        else:
+            # the QP is 0.5 |L' (U - unconstrained)|^2 + const, a bounded least squares problem
+            constrained += 1
+            expected = lsq_linear(cholesky.T, cholesky.T @ unconstrained, bounds=(-3.0, 3.0), tol=1e-12).x
+            assert abs(u - expected[0]) < 1e-6
+        assert -3.0 <= u <= 3.0
+        plant.update(u)
+    assert constrained > 0
+    assert abs(plant.x[0] - 1.0) < 1e-6
+
+    # the condensed problem is shared by controllers on the same model
+    assert ModelPredictiveController.from_model(plant, 20, 10.0, 0.1).gain is controller.gain
+
+
+def main():
+    test_pid_bank()
+    test_fixed_rate_pid()
+    test_gain_scheduled_pid()
+    test_mpc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import numpy as np
+from scipy.signal import butter, upfirdn
+
+from dsp_toolbox.dsp.filters.exponential_filter import ExponentialFilter
+from dsp_toolbox.dsp.filters.filter_chain import FilterChain
+from dsp_toolbox.dsp.filters.fir_filter import FIRFilter
+from dsp_toolbox.dsp.filters.iir_filter import IIRFilter
+from dsp_toolbox.dsp.filters.kalman_filter import KalmanFilter, steady_state_gain
+from dsp_toolbox.dsp.filters.median_filter import MedianFilter
+from dsp_toolbox.dsp.filters.resampler import Decimator, Resampler
+from dsp_toolbox.dsp.filters.sos_filter import Design, Response, SOSFilter, design_sos
+
+
+def test_median_filter():
+    rng = np.random.default_rng(0)
+    signal = rng.normal(size=500)
+    signal[::37] += 20.0
+
+    for window_size in [1, 4, 9]:
+        sequential = MedianFilter(window_size)
+        outputs = np.array([sequential.update(value) for value in signal])
+        for n in range(len(signal)):
+            window = np.sort(signal[max(0, n - window_size + 1):n + 1])
+            assert outputs[n] == window[len(window) // 2]
+            deviation = np.sort(np.abs(window - outputs[n]))[len(window) // 2]
+            if n == len(signal) - 1:
+                assert sequential.median_deviation() == deviation
+
+        block = MedianFilter(window_size)
+        processed = np.concatenate([block.process(signal[:3]), block.process(signal[3:200]), block.process(signal[200:])])
+        np.testing.assert_array_equal(processed, outputs)
+        assert list(block.window) == list(sequential.window)
+
+    hampel = MedianFilter(9, outlier_threshold=3.0)
+    cleaned = hampel.process(signal)
+    assert np.abs(cleaned[1:]).max() < 5.0
+    changed = cleaned != signal
+    assert changed[::37][1:].all()
+    assert changed.sum() < 0.1 * len(signal)
+
+    reference = MedianFilter(9, outlier_threshold=3.0)
+    np.testing.assert_array_equal([reference.update(value) for value in signal], cleaned)
+
+
+def test_iir_block_processing():
+    b, a = butter(3, 0.1)
+    signal = 5.0 + np.random.default_rng(1).normal(size=400)
+    sequential = IIRFilter(a, b, order=3)
+    outputs = np.array([sequential.update(value) for value in signal])
+
+    block = IIRFilter(a, b, order=3)
+    processed = np.concatenate([
+        block.process(signal[:2]),
+        [block.update(value) for value in signal[2:50]],
+        block.process(signal[50:51]),
+        block.process(signal[51:])
+    ])
+    np.testing.assert_allclose(processed, outputs, rtol=1e-12)
+    np.testing.assert_allclose(np.array(block.buffer), np.array(sequential.buffer), rtol=1e-12)
+    np.testing.assert_allclose(block.update(signal[-1]), sequential.update(signal[-1]), rtol=1e-12)
+
+
+def test_block_api():
+    signal = np.random.default_rng(2).normal(size=1000)
+    for make_filter in [
+        lambda: ExponentialFilter(0.2),
+        lambda: IIRFilter([1.0, -0.9], [0.05, 0.05]),
+        lambda: MedianFilter(5, outlier_threshold=3.0)
+    ]:
+        sequential = make_filter()
+        outputs = np.array([sequential.update(value) for value in signal])
+        block = make_filter()
+        processed = np.concatenate([block.process(signal[:1]), block.process(signal[1:])])
+        np.testing.assert_allclose(processed, outputs, rtol=1e-12, atol=1e-15)
+        assert len(block.process(np.empty(0))) == 0
+
+    sequential = ExponentialFilter(0.2)
+    outputs = [sequential.update(value) for value in signal]
+    np.testing.assert_array_equal(ExponentialFilter(0.2).process(signal), outputs)
+
+
+def test_multichannel_filters():
+    signal = np.random.default_rng(3).normal(size=(4, 300))
+    cutoffs = [0.1, 0.2, 0.3, 0.4]
+    designs = [butter(2, cutoff) for cutoff in cutoffs]
+    for make_filter, make_single in [
+        (lambda: ExponentialFilter(0.3, channels=4), lambda c: ExponentialFilter(0.3)),
+        (lambda: ExponentialFilter(cutoffs, channels=4), lambda c: ExponentialFilter(cutoffs[c])),
+        (lambda: IIRFilter(designs[1][1], designs[1][0], order=2, channels=4),
+         lambda c: IIRFilter(designs[1][1], designs[1][0], order=2)),
+        (lambda: IIRFilter([a for b, a in designs], [b for b, a in designs], order=2, channels=4),
+         lambda c: IIRFilter(designs[c][1], designs[c][0], order=2))
+    ]:
+        singles = [make_single(c) for c in range(4)]
+        expected = np.array([[singles[c].update(value) for value in signal[c]] for c in range(4)])
+        vectorized = make_filter()
+        outputs = np.stack([vectorized.update(signal[:, n]) for n in range(300)], axis=1)
+        np.testing.assert_allclose(outputs, expected, rtol=1e-12, atol=1e-15)
+
+        block = make_filter()
+        processed = np.concatenate([
+            block.process(signal[:, :1]),
+            block.process(signal[:, 1:150]),
+            np.stack([block.update(signal[:, n]) for n in range(150, 160)], axis=1),
+            block.process(signal[:, 160:])
+        ], axis=1)
+        np.testing.assert_allclose(processed, expected, rtol=1e-12, atol=1e-14)
+
+
+def test_sos_filter():
+    assert design_sos(Design.BUTTERWORTH, 6, 10, 100) is design_sos(Design.BUTTERWORTH, 6, 10.0, 100.0)
+    np.testing.assert_allclose(
+        design_sos(Design.BUTTERWORTH, 4, [5, 20], 100, Response.BANDPASS),
+        butter(4, [0.1, 0.4], btype="bandpass", output="sos")
+    )
+
+    signal = 2.0 + np.random.default_rng(4).normal(size=(3, 500))
+    for make_filter in [
+        lambda channels=None: SOSFilter.butterworth(6, 10, 100, channels=channels),
+        lambda channels=None: SOSFilter.chebyshev(4, (5, 20), 100, 1.0, Response.BANDPASS, channels=channels),
+        lambda channels=None: SOSFilter.chebyshev(
+            5, 20, 100, 40.0, Response.HIGHPASS, Design.CHEBYSHEV2, channels=channels
+        )
+    ]:
+        sequential = make_filter()
+        outputs = np.array([sequential.update(value) for value in signal[0]])
+        block = make_filter()
+        processed = np.concatenate([
+            block.process(signal[0, :1]),
+            block.process(signal[0, 1:300]),
+            [block.update(value) for value in signal[0, 300:310]],
+            block.process(signal[0, 310:])
+        ])
+        np.testing.assert_allclose(processed, outputs, rtol=1e-12, atol=1e-14)
+
+        multichannel = make_filter(3)
+        vectorized = np.stack([multichannel.update(signal[:, n]) for n in range(250)], axis=1)
+        vectorized = np.concatenate([vectorized, multichannel.process(signal[:, 250:])], axis=1)
+        for c in range(3):
+            single = make_filter()
+            np.testing.assert_allclose(vectorized[c], single.process(signal[c]), rtol=1e-12, atol=1e-14)
+
+    settled = SOSFilter.butterworth(4, 5, 100)
+    np.testing.assert_allclose(settled.process(np.full(50, 3.0)), 3.0)
+
+
+def test_filter_chain():
+    b, a = butter(2, 0.1)
+    b1, a1 = butter(1, 0.2)
+
+    def make_stages():
+        return [
+            ExponentialFilter(0.3),
+            IIRFilter(a, b, order=2),
+            IIRFilter(a1, b1),
+            MedianFilter(5),
+            ExponentialFilter(0.5),
+            SOSFilter.butterworth(4, 10, 100)
+        ]
+
+    signal = 3.0 + np.random.default_rng(5).normal(size=2000)
+    stages = make_stages()
+    expected = []
+    for value in signal:
+        for stage in stages:
+            value = stage.update(value)
+        expected.append(value)
+
+    chain = FilterChain(make_stages())
+    assert [type(stage) for stage in chain.stages] == [SOSFilter, MedianFilter, SOSFilter]
+    assert len(chain.stages[0].sos) == 3
+    np.testing.assert_allclose([chain.update(value) for value in signal[:100]], expected[:100], rtol=1e-12)
+    np.testing.assert_allclose(chain.process(signal[100:]), expected[100:], rtol=1e-12)
+
+    state = chain.snapshot()
+    replay = chain.process(signal)
+    chain.restore(state)
+    np.testing.assert_array_equal(chain.process(signal), replay)
+
+    # stages that don't start settled on their first input keep their own start
+    high_b, high_a = butter(2, 0.1, "high")
+    for make_stages in (
+        lambda: [ExponentialFilter(0.3), IIRFilter(high_a, high_b, order=2), ExponentialFilter(0.5)],
+        lambda: [ExponentialFilter(0.3), IIRFilter(a, b, order=2, initial_value=5.0), IIRFilter(a1, b1)],
+    ):
+        stages = make_stages()
+        expected = []
+        for value in signal:
+            for stage in stages:
+                value = stage.update(value)
+            expected.append(value)
+        chain = FilterChain(make_stages())
+        assert len(chain.stages) == 3
+        np.testing.assert_allclose(chain.process(signal), expected, rtol=1e-12, atol=1e-12)
+
+    separate = FilterChain([ExponentialFilter(0.3), ExponentialFilter([0.1, 0.2], channels=2)])
+    assert [type(stage) for stage in separate.stages] == [ExponentialFilter, ExponentialFilter]
+    assert separate.to_sos() is None
+
+
+def test_fir_filter():
+    rng = np.random.default_rng(6)
+    signal = rng.normal(size=(2, 5000))
+    for num_taps in [1, 5, 100, 1500]:
+        taps = rng.normal(size=num_taps)
+        expected = np.convolve(np.concatenate([np.full(num_taps - 1, signal[0, 0]), signal[0]]), taps, "valid")
+
+        sequential = FIRFilter(taps)
+        np.testing.assert_allclose([sequential.update(value) for value in signal[0]], expected, atol=1e-12)
+
+        block = FIRFilter(taps)
+        processed = np.concatenate([
+            block.process(signal[0, :1]),
+            block.process(signal[0, 1:30]),
+            [block.update(value) for value in signal[0, 30:40]],
+            block.process(signal[0, 40:])
+        ])
+        np.testing.assert_allclose(processed, expected, atol=1e-12)
+
+        multichannel = FIRFilter(taps, channels=2, max_block_samples=4096)
+        processed = np.concatenate([
+            multichannel.process(signal[:, :2000]),
+            np.stack([multichannel.update(signal[:, n]) for n in range(2000, 2100)], axis=1),
+            multichannel.process(signal[:, 2100:])
+        ], axis=1)
+        np.testing.assert_allclose(processed[0], expected, atol=1e-12)
+
+
+def test_resampler():
+    signal = np.random.default_rng(7).normal(size=3001)
+    for up, down in [(1, 3), (1, 100), (3, 1), (2, 3), (10, 6)]:
+        resampler = Resampler(up, down)
+        # prime upfirdn with copies of the first value, as many as keep the phases aligned
+        prefix = resampler.down * -(-resampler.num_phase_taps // resampler.down)
+        expected = upfirdn(
+            resampler.taps, np.concatenate([np.full(prefix, signal[0]), signal]), resampler.up, resampler.down
+        )[prefix * resampler.up // resampler.down:]
+
+        outputs = np.concatenate([
+            resampler.process(signal[:1]),
+            resampler.process(signal[1:7]),
+            *[resampler.update(value) for value in signal[7:20]],
+            resampler.process(signal[20:])
+        ])
+        assert len(outputs) == -(-len(signal) * resampler.up // resampler.down)
+        np.testing.assert_allclose(outputs, expected[:len(outputs)], atol=1e-12)
+
+        multichannel = Resampler(up, down, channels=2)
+        both = np.stack([signal, 2 * signal])
+        outputs_2d = np.concatenate([multichannel.process(both[:, :500]), multichannel.process(both[:, 500:])], axis=1)
+        np.testing.assert_allclose(outputs_2d, [outputs, 2 * outputs], atol=1e-12)
+
+    decimator = Decimator(100)
+    assert [len(decimator.update(1.0)) for _ in range(201)].count(1) == 3
+    np.testing.assert_allclose(decimator.process(np.ones(1000)), 1.0, rtol=1e-3)
+
+
+def test_kalman_filter():
+    rng = np.random.default_rng(8)
+
+    # a random walk seen through white noise is optimally smoothed by an exponential filter
+    gain, _ = steady_state_gain(1.0, 1.0, 0.01, 1.0)
+    signal = rng.normal(size=200)
+    random_walk = KalmanFilter(1.0, 1.0, 0.01, 1.0, steady_state=True)
+    exponential = ExponentialFilter(gain[0, 0])
+    np.testing.assert_allclose(random_walk.process(signal)[0], exponential.process(signal), atol=1e-12)
+
+    delta_t = 0.1
+    A = [[1.0, delta_t], [0.0, 1.0]]
+    C = [[1.0, 0.0]]
+    Q = np.diag([1e-4, 1e-3])
+    R = [[0.05]]
+    position = np.cumsum(np.full(500, 0.3 * delta_t))
+    measurements = np.stack([position, -position]) + rng.normal(scale=0.2, size=(2, 500))
+
+    batched = KalmanFilter(A, C, Q, R, channels=2)
+    estimates = np.stack([batched.update(measurements[:, n]) for n in range(500)], axis=-1)
+    assert estimates.shape == (2, 2, 500)
+    np.testing.assert_allclose(estimates[:, 1, -100:].mean(axis=1), [0.3, -0.3], atol=0.05)
+    for c in range(2):
+        single = KalmanFilter(A, C, Q, R)
+        np.testing.assert_allclose(single.process(measurements[c]), estimates[c], atol=1e-12)
+
+    steady = KalmanFilter(A, C, Q, R, channels=2, steady_state=True)
+    np.testing.assert_allclose(steady.process(measurements)[..., -100:], estimates[..., -100:], atol=1e-9)
+    assert steady.gain is steady_state_gain(A, C, Q, R)[0]
+
+
+def main():
+    test_median_filter()
+    test_iir_block_processing()
+    test_block_api()
+    test_multichannel_filters()
+    test_sos_filter()
+    test_filter_chain()
+    test_fir_filter()
+    test_resampler()
+    test_kalman_filter()
+
+
+if __name__ == "__main__":
+    main()
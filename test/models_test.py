@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from dsp_toolbox.dsp.models.history import ArrayHistory, RingHistory
+from dsp_toolbox.dsp.models.model import Discretization
+from dsp_toolbox.dsp.models.first_order_model import FirstOrderModel
+from dsp_toolbox.dsp.models.second_order_model import SecondOrderForm, SecondOrderModel
+from dsp_toolbox.dsp.models.state_space_model import StateSpaceModel, discretize
+from dsp_toolbox.dsp.models.dead_time_model import DelayLine, DeadTimeModel
+from dsp_toolbox.dsp.models.nonlinear_model import NonlinearModel, Integrator
+
+
+def test_array_history():
+    history = ArrayHistory(0.0, capacity=2)
+    for i in range(1, 10):
+        history.append(float(i))
+    assert len(history) == 10
+    assert history[-1] == 9.0
+    np.testing.assert_array_equal(history.view(), np.arange(10.0))
+
+    batched = ArrayHistory(1.0)
+    batched.append(np.array([2.0, 3.0]))
+    np.testing.assert_array_equal(batched.view(), [[1.0, 1.0], [2.0, 3.0]])
+    np.testing.assert_array_equal(batched[-1], [2.0, 3.0])
+
+    state = history.get_state()
+    history.append(10.0)
+    history.set_state(state)
+    assert history[-1] == 9.0
+    history.append(np.float64(10.0))
+    assert history[-1] == 10.0 and len(history) == 11
+
+
+def test_ring_history():
+    history = RingHistory(0.0, max_samples=4)
+    for i in range(1, 10):
+        history.append(float(i))
+        assert history[-1] == float(i)
+    assert len(history) == 4
+    np.testing.assert_array_equal(history.view(), [6.0, 7.0, 8.0, 9.0])
+    assert np.shares_memory(history.view(), history.buffer)
+
+
+def test_model_history_modes():
+    unbounded = FirstOrderModel(gain=2.0, time_constant=1.0, horizon=10)
+    bounded = FirstOrderModel(gain=2.0, time_constant=1.0, max_history=5)
+    for _ in range(100):
+        unbounded.update(1.0)
+        bounded.update(1.0)
+    assert len(unbounded.pv) == 101
+    np.testing.assert_array_equal(bounded.pv.view(), unbounded.pv.view()[-5:])
+
+
+def test_state_space_model():
+    model = FirstOrderModel(
+        gain=2.0,
+        time_constant=0.5,
+        delta_t=0.1,
+        discretization=Discretization.ZERO_ORDER_HOLD
+    )
+    for _ in range(20):
+        model.update(1.0)
+    expected = 2.0 * (1 - np.exp(-np.arange(21) * 0.1 / 0.5))
+    np.testing.assert_allclose(model.pv.view(), expected)
+
+    Ad, _ = discretize([[-2.0]], [[4.0]], 0.1)
+    assert Ad is model.state_space.Ad
+
+    second = SecondOrderModel(
+        natural_frequency=2.0,
+        damping_ratio=0.7,
+        delta_t=0.5,
+        discretization=Discretization.ZERO_ORDER_HOLD,
+        form=SecondOrderForm.OSCILLATOR
+    )
+    for _ in range(40):
+        second.update(3.0)
+    assert np.isclose(second.pv[-1], 3.0)
+
+    # the discretization only changes the accuracy, not the plant
+    peaks = []
+    for discretization, delta_t in ((Discretization.EULER, 0.001), (Discretization.ZERO_ORDER_HOLD, 0.1)):
+        oscillator = SecondOrderModel(
+            1.0, 0.25, delta_t=delta_t, discretization=discretization, form=SecondOrderForm.OSCILLATOR
+        )
+        for _ in range(int(10.0 / delta_t)):
+            oscillator.update(1.0)
+        peaks.append(oscillator.pv.view().max())
+    expected_peak = 1 + np.exp(-np.pi * 0.25 / np.sqrt(1 - 0.25 ** 2))
+    np.testing.assert_allclose(peaks, expected_peak, rtol=2e-3)
+    with pytest.raises(ValueError):
+        SecondOrderModel(1.0, 0.25, discretization=Discretization.ZERO_ORDER_HOLD)
+
+    batched = StateSpaceModel([[-1.0]], [[1.0]], [[1.0]])
+    np.testing.assert_allclose(batched.update(np.array([1.0, 2.0])), [0.01, 0.02], rtol=1e-2)
+
+
+def test_dead_time_model():
+    reference = FirstOrderModel(gain=2.0, time_constant=0.5)
+    delayed = DeadTimeModel(FirstOrderModel(gain=2.0, time_constant=0.5), dead_time=0.05)
+    for _ in range(50):
+        reference.update(1.0)
+        delayed.update(1.0)
+    np.testing.assert_array_equal(delayed.pv.view()[:6], np.zeros(6))
+    np.testing.assert_array_equal(delayed.pv.view()[5:], reference.pv.view()[:-5])
+
+    line = DelayLine(np.array([0, 1, 3]))
+    outputs = np.array([line.push(np.full(3, float(i))) for i in range(1, 6)])
+    np.testing.assert_array_equal(outputs[:, 0], [1, 2, 3, 4, 5])
+    np.testing.assert_array_equal(outputs[:, 1], [0, 1, 2, 3, 4])
+    np.testing.assert_array_equal(outputs[:, 2], [0, 0, 0, 1, 2])
+
+
+def car(x: np.ndarray, u: float, t: float) -> np.ndarray:
+    force = np.clip(u, 0.0, 5000.0)
+    return np.stack([(force - 0.33 * x[0] * np.abs(x[0])) / 2140.0])
+
+
+def test_nonlinear_model():
+    adaptive = NonlinearModel(car, [0.0], delta_t=0.1, integrator=Integrator.RK45)
+    fixed = NonlinearModel(car, [0.0], delta_t=0.1, substeps=10)
+    for _ in range(600):
+        adaptive.update(3000.0)
+        fixed.update(3000.0)
+    exact = solve_ivp(lambda t, x: car(x, 3000.0, t), (0, 60), [0.0], rtol=1e-10, atol=1e-12)
+    assert np.isclose(adaptive.pv[-1], exact.y[0, -1], rtol=1e-6)
+    assert np.isclose(fixed.pv[-1], exact.y[0, -1], rtol=1e-6)
+    assert adaptive.step_size == 0.1
+
+    batched = NonlinearModel(car, [0.0], delta_t=0.1)
+    single = NonlinearModel(car, [0.0], delta_t=0.1)
+    for _ in range(50):
+        y = batched.update(np.array([1000.0, 3000.0]))
+        single.update(3000.0)
+    assert y.shape == (2,)
+    assert y[1] == single.pv[-1]
+
+    # batched RK45 steps for the worst plant, a stiff one isn't diluted by the others
+    rates = np.concatenate([[50.0], np.full(99, 0.1)])
+    stiff = lambda x, u, t: -rates * (x - u) * (1 + x ** 2)
+    batched = NonlinearModel(stiff, [0.0], delta_t=0.1, integrator=Integrator.RK45)
+    alone = NonlinearModel(
+        lambda x, u, t: -50.0 * (x - u) * (1 + x ** 2), [0.0], delta_t=0.1, integrator=Integrator.RK45
+    )
+    for _ in range(20):
+        y = batched.update(np.ones(100))
+        alone.update(1.0)
+    exact = solve_ivp(
+        lambda t, x: -50.0 * (x - 1.0) * (1 + x ** 2), (0, 2), [0.0], method="LSODA", rtol=1e-12, atol=1e-14
+    )
+    assert y.shape == (100,)
+    assert abs(y[0] - exact.y[0, -1]) <= 2 * abs(alone.pv[-1] - exact.y[0, -1]) + 1e-12
+
+
+def main():
+    test_array_history()
+    test_ring_history()
+    test_model_history_modes()
+    test_state_space_model()
+    test_dead_time_model()
+    test_nonlinear_model()
+
+
+if __name__ == "__main__":
+    main()
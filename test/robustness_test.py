@@ -0,0 +1,46 @@
+import numpy as np
+
+from dsp_toolbox.dsp.types import PIDGains
+from dsp_toolbox.dsp.controllers.pid import PIDController
+from dsp_toolbox.dsp.models.first_order_model import FirstOrderModel
+from dsp_toolbox.optimization.robustness import RobustnessAnalysis, normal, lognormal
+
+
+def test_robustness_analysis():
+    analysis = RobustnessAnalysis(
+        gains=PIDGains(2.0, 2.0, 0.0),
+        model_type=FirstOrderModel,
+        distributions={
+            "gain": normal(3.5, 0.3),
+            "time_constant": lognormal(1.0, 0.2),
+        },
+        setpoint=10.0,
+        num_samples=1000,
+        output_limits=[0, 100]
+    )
+    report = analysis.run(2000, seed=1)
+    assert report.overshoot.shape == (2000,)
+    assert report.envelope.shape == (3, 1000)
+    assert np.all(report.envelope[0] <= report.envelope[2])
+    summary = report.summary()
+    assert np.all(np.diff(summary["settling_time"]) >= 0)
+    assert np.isfinite(summary["cost"]).all()
+
+    worst = np.argmax(report.overshoot)
+    model = FirstOrderModel(
+        gain=report.parameters["gain"][worst],
+        time_constant=report.parameters["time_constant"][worst]
+    )
+    pid = PIDController(kp=2.0, ki=2.0, kd=0.0, output_limits=[0, 100])
+    pv = [model.pv[-1]]
+    for i in range(1000):
+        pv.append(model.update(pid.update(pv[-1], 10.0, i * 0.01)))
+    assert np.isclose(report.overshoot[worst], 100.0 * (max(pv[:-1]) - 10.0) / 10.0)
+
+
+def main():
+    test_robustness_analysis()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import asyncio
+
+from dsp_toolbox.dsp.controllers.pid import PIDController
+from dsp_toolbox.dsp.filters.exponential_filter import ExponentialFilter
+from dsp_toolbox.dsp.models.first_order_model import FirstOrderModel
+from dsp_toolbox.runtime.scheduler import ControlLoop, Scheduler
+
+
+def test_scheduler():
+    plant = FirstOrderModel(gain=2.0, time_constant=0.05, initial_condition=0.0, delta_t=0.005)
+    sent = []
+
+    async def slow_actuator(output):
+        sent.append(output)
+        await asyncio.sleep(0.025)
+
+    scheduler = Scheduler()
+    fast = scheduler.add(ControlLoop(
+        period=0.005,
+        sensor=lambda: plant.pv[-1],
+        controller=PIDController(kp=1.0, ki=20.0, kd=0.0, output_limits=(-10.0, 10.0)),
+        actuator=plant.update,
+        setpoint=lambda t: 1.0 if t > 0.01 else 0.0,
+        measurement_filter=ExponentialFilter(0.5)
+    ))
+    slow = scheduler.add(ControlLoop(
+        period=0.01,
+        sensor=lambda: 0.0,
+        controller=PIDController(kp=1.0, ki=0.0, kd=0.0, output_limits=(-1.0, 1.0)),
+        actuator=slow_actuator,
+        setpoint=1.0
+    ))
+    asyncio.run(scheduler.run(duration=0.4))
+
+    # cycle counts are bounded by the absolute release times however late the wake-ups
+    assert 20 <= fast.stats.cycles <= 81
+    assert fast.stats.mean_lateness >= 0.0
+    assert abs(plant.pv[-1] - 1.0) < 0.2
+
+    # each slow cycle overruns two releases, which are skipped, not run back to back
+    assert slow.stats.cycles == len(sent)
+    assert slow.stats.misses == slow.stats.cycles or slow.stats.misses == slow.stats.cycles - 1
+    assert slow.stats.cycles <= 0.4 / 0.03 + 1
+    assert slow.stats.skipped >= 2 * (slow.stats.cycles - 1)
+    assert set(slow.stats.summary()) >= {"cycles", "misses", "jitter", "max_lateness"}
+
+    # an empty scheduler just waits out the duration
+    empty = Scheduler()
+    asyncio.run(empty.run(duration=0.01))
+    assert not empty.running
+
+
+def main():
+    test_scheduler()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
-from dsp_toolbox.dsp.simulation import Simulation
+from dsp_toolbox.dsp.simulation import Simulation, BatchSimulation
 from dsp_toolbox.dsp.controllers.pid import PIDController
 from dsp_toolbox.dsp.models.first_order_model import FirstOrderModel
 from dsp_toolbox.dsp.models.second_order_model import SecondOrderModel
+from dsp_toolbox.dsp.models.dead_time_model import DeadTimeModel
+from dsp_toolbox.dsp.recorder import SignalRecorder
+from dsp_toolbox.dsp import profiles
+from dsp_toolbox.dsp.snapshot import load_snapshot
+from dsp_toolbox.dsp.filters.exponential_filter import ExponentialFilter
+from dsp_toolbox.dsp.stop_criteria import (
+    SettledCriterion,
+    DivergedCriterion,
+    OscillationCriterion
+)
+from dsp_toolbox.optimization.cost import PIDCost, RecordingCost
 
 
 def first_order_test():
@@ -54,9 +65,245 @@ def second_order_test():
     plt.show()
     
 
+def test_batch_simulation():
+    kp = np.array([1.0, 3.0, 5.0])
+    ki = np.array([0.0, 0.5, 1.0])
+    controller = PIDController(
+        kp=kp,
+        ki=ki,
+        kd=0.0,
+        output_limits=[0, 100]
+    )
+    model = FirstOrderModel(
+        gain=3.5,
+        time_constant=np.array([1.0, 2.0, 0.5]),
+        initial_condition=0.0
+    )
+    sim = BatchSimulation(
+        controller=controller,
+        model=model,
+        setpoint=10,
+        num_loops=3
+    )
+    data = sim.run(200)
+    assert data.shape == (3, 200)
+
+    for n in range(3):
+        pid = PIDController(kp=kp[n], ki=ki[n], kd=0.0, output_limits=[0, 100])
+        single = FirstOrderModel(
+            gain=3.5,
+            time_constant=model.time_constant[n],
+            initial_condition=0.0
+        )
+        for i in range(200):
+            assert np.isclose(data[n, i], single.pv[-1])
+            single.update(pid.update(single.pv[-1], 10, i * 0.01))
+
+    # per-loop limits on every term, with scalar gains so the first d_term is a float
+    high = np.array([50.0, 100.0, 20.0])
+    limits = {
+        "output_limits": (np.zeros(3), high),
+        "p_limits": (-high, high),
+        "i_limits": (np.array([-1.0, -2.0, -3.0]), np.array([1.0, 2.0, 3.0])),
+        "d_limits": (np.array([-1.0, -2.0, -3.0]), np.array([1.0, 2.0, 3.0])),
+    }
+    sim = BatchSimulation(
+        controller=PIDController(kp=kp, ki=1.0, kd=0.1, **limits),
+        model=FirstOrderModel(gain=3.5, time_constant=np.array([1.0, 2.0, 0.5])),
+        setpoint=10,
+        num_loops=3
+    )
+    data = sim.run(200)
+    for n in range(3):
+        pid = PIDController(
+            kp=kp[n], ki=1.0, kd=0.1,
+            **{name: (low[n], upper[n]) for name, (low, upper) in limits.items()}
+        )
+        single = FirstOrderModel(gain=3.5, time_constant=sim.model.time_constant[n])
+        for i in range(200):
+            assert np.isclose(data[n, i], single.pv[-1])
+            single.update(pid.update(single.pv[-1], 10, i * 0.01))
+
+
+def test_signal_recorder():
+    controller = PIDController(kp=2.0, ki=1.0, kd=0.0, output_limits=[0, 100])
+    model = FirstOrderModel(gain=3.5, time_constant=1.0)
+    recorder = SignalRecorder(num_samples=100)
+    sim = Simulation(controller=controller, model=model, setpoint=10, recorder=recorder)
+    pv = sim.run(100)
+
+    assert len(recorder) == 100
+    np.testing.assert_array_equal(recorder["pv"], pv[:-1])
+    np.testing.assert_array_equal(recorder["error"], 10 - pv[:-1])
+    np.testing.assert_allclose(
+        recorder["u"],
+        recorder["p_term"] + recorder["i_term"] + recorder["d_term"]
+    )
+    cost = RecordingCost(1.0, 0.1, recorder)
+    assert cost == PIDCost(1.0, 0.1, np.full(100, 10), pv[:-1], recorder["u"])
+
+    # steps beyond num_samples grow the columns instead of being dropped
+    sim.run(100)
+    assert len(recorder) == 200
+    np.testing.assert_array_equal(recorder["pv"], model.pv.view()[:-1])
+    growing = SignalRecorder(num_samples=3, decimation=2)
+    for step in range(20):
+        growing.record(float(step), 0.0, 0.0, controller)
+    np.testing.assert_array_equal(growing["pv"], np.arange(0.0, 20.0, 2.0))
+
+    decimated = SignalRecorder(num_samples=100, decimation=10, num_loops=2)
+    batch = BatchSimulation(
+        controller=PIDController(kp=np.array([1.0, 2.0]), ki=0.0, kd=0.0, output_limits=[0, 100]),
+        model=FirstOrderModel(gain=3.5, time_constant=1.0),
+        setpoint=10,
+        num_loops=2,
+        recorder=decimated
+    )
+    data = batch.run(100)
+    assert decimated["pv"].shape == (10, 2)
+    np.testing.assert_array_equal(decimated["pv"], data[:, ::10].T)
+    assert RecordingCost(1.0, 0.1, decimated).shape == (2,)
+
+
+def test_early_termination():
+    settled = SettledCriterion(band=1.0, duration=0.5)
+    sim = Simulation(
+        controller=PIDController(kp=5.0, ki=5.0, kd=0.0, output_limits=[0, 100]),
+        model=FirstOrderModel(gain=3.5, time_constant=1.0),
+        setpoint=10
+    )
+    chunks = list(sim.iter(10000, chunk_size=64, criteria=[settled]))
+    assert sim.stop_reason is settled
+    assert sim.num_steps < 10000
+    assert sum(len(chunk) for chunk in chunks) == sim.num_steps
+    assert abs(chunks[-1][-1] - 10) <= 1.0
+
+    batch = BatchSimulation(
+        controller=PIDController(kp=np.array([2.0, 20.0]), ki=0.0, kd=0.0, output_limits=[0, 100]),
+        model=DeadTimeModel(
+            FirstOrderModel(gain=3.5, time_constant=1.0),
+            dead_time=np.array([0.0, 0.5])
+        ),
+        setpoint=10,
+        num_loops=2
+    )
+    data = batch.run(
+        10000,
+        criteria=[SettledCriterion(band=5.0, duration=1.0), OscillationCriterion(num_crossings=4)]
+    )
+    assert batch.done.all()
+    assert data.shape == (2, batch.num_steps)
+    assert batch.stop_steps.max() == batch.num_steps
+
+    diverged = DivergedCriterion(bound=100.0)
+    assert diverged(np.array([0.0, 500.0]), 10, 0.0).tolist() == [False, True]
+
+
+def test_profiles():
+    np.testing.assert_array_equal(profiles.step(5, 1.0, 2.0, 3.0), [0, 0, 3, 3, 3])
+    np.testing.assert_array_equal(profiles.ramp(5, 1.0, 1.0, 3.0, 4.0), [0, 0, 2, 4, 4])
+    np.testing.assert_array_equal(
+        profiles.piecewise(5, 1.0, [0.0, 2.0, 4.0], [1.0, 2.0, 3.0]),
+        [1, 1, 2, 2, 3]
+    )
+    sequence = profiles.prbs(254, amplitude=1.0, order=7, hold_samples=2)
+    assert set(np.unique(sequence)) == {-1.0, 1.0}
+    np.testing.assert_array_equal(sequence[::2], sequence[1::2])
+    assert not sequence.flags.writeable
+
+    setpoint = profiles.ramp(300, 0.01, 0.0, 1.0, 10.0)
+    disturbance = profiles.step(300, 0.01, 2.0, -1.0)
+    recorder = SignalRecorder(num_samples=300)
+    sim = Simulation(
+        controller=PIDController(kp=5.0, ki=0.0, kd=0.0, output_limits=[0, 100]),
+        model=FirstOrderModel(gain=3.5, time_constant=1.0),
+        setpoint=setpoint,
+        recorder=recorder,
+        disturbance=disturbance
+    )
+    sim.run(300)
+    np.testing.assert_array_equal(recorder["setpoint"], setpoint)
+
+    batch = BatchSimulation(
+        controller=PIDController(kp=np.full(2, 5.0), ki=0.0, kd=0.0, output_limits=[0, 100]),
+        model=FirstOrderModel(gain=3.5, time_constant=1.0),
+        setpoint=setpoint[None, :],
+        num_loops=2,
+        disturbance=disturbance
+    )
+    data = batch.run(300)
+    np.testing.assert_allclose(data[0], data[1])
+
+
+def make_fopdt_simulation(**kwargs) -> BatchSimulation:
+    return BatchSimulation(
+        controller=PIDController(kp=np.array([2.0, 4.0]), ki=1.0, kd=0.1, output_limits=[0, 100]),
+        model=DeadTimeModel(FirstOrderModel(gain=3.5, time_constant=1.0), dead_time=0.2),
+        setpoint=profiles.step(400, 0.01, 1.0, 10.0)[None, :],
+        num_loops=2,
+        recorder=SignalRecorder(num_samples=400, num_loops=2),
+        **kwargs
+    )
+
+
+def test_snapshot_resume(tmp_path):
+    reference = make_fopdt_simulation()
+    expected = reference.run(400)
+
+    path = str(tmp_path / "checkpoint.bin")
+    interrupted = make_fopdt_simulation(checkpoint_path=path, checkpoint_interval=100)
+    interrupted.run(250)
+    resumed = make_fopdt_simulation()
+    load_snapshot(path, resumed)
+    assert resumed.elapsed_steps == 200
+    resumed.run(200)
+    np.testing.assert_array_equal(resumed.model.pv.view(), reference.model.pv.view())
+    np.testing.assert_array_equal(resumed.recorder["u"], reference.recorder["u"])
+
+    # a scalar run resumed in a new process continues on simulated time, whatever
+    # the wall clock gap since the checkpoint
+    def make_scalar_simulation(**kwargs) -> Simulation:
+        return Simulation(
+            controller=PIDController(kp=2.0, ki=1.0, kd=0.1, output_limits=[0, 100]),
+            model=FirstOrderModel(gain=3.5, time_constant=1.0),
+            setpoint=10.0,
+            **kwargs
+        )
+
+    scalar_reference = make_scalar_simulation()
+    scalar_reference.run(400)
+    scalar_path = str(tmp_path / "scalar.bin")
+    make_scalar_simulation(checkpoint_path=scalar_path, checkpoint_interval=100).run(250)
+    scalar_resumed = make_scalar_simulation()
+    load_snapshot(scalar_path, scalar_resumed)
+    scalar_resumed.run(200)
+    np.testing.assert_array_equal(scalar_resumed.model.pv.view(), scalar_reference.model.pv.view())
+    assert scalar_resumed.controller.integrated_error == scalar_reference.controller.integrated_error
+
+    warm = make_fopdt_simulation()
+    warm.run(100)
+    branch = warm.fork()
+    branch.run(300)
+    warm.run(300)
+    np.testing.assert_array_equal(branch.model.pv.view(), warm.model.pv.view())
+    np.testing.assert_array_equal(warm.model.pv.view()[1:-1, 0], expected[0, 1:])
+
+    smoothing = ExponentialFilter(alpha=0.1)
+    for value in range(10):
+        smoothing.update(float(value))
+    snapshot = smoothing.snapshot()
+    after = smoothing.update(5.0)
+    smoothing.restore(snapshot)
+    assert smoothing.update(5.0) == after
+
+
 def main():
     first_order_test()
     second_order_test()
+    test_batch_simulation()
+    test_signal_recorder()
+    test_early_termination()
+    test_profiles()
     
     
 if __name__ == "__main__":
@@ -0,0 +1,50 @@
+import numpy as np
+
+from dsp_toolbox.dsp.models.first_order_model import FirstOrderModel
+from dsp_toolbox.dsp.stop_criteria import SettledCriterion
+from dsp_toolbox.optimization.sweep import ParameterSweep
+
+
+def final_value(trajectory: np.ndarray) -> np.ndarray:
+    return trajectory[:, -1]
+
+
+def test_parameter_sweep():
+    parameters = ParameterSweep.grid(
+        kp=[1.0, 2.0, 5.0],
+        ki=[0.0, 1.0],
+        time_constant=[0.5, 1.0, 2.0]
+    )
+    sweep = ParameterSweep(
+        model_type=FirstOrderModel,
+        setpoint=10,
+        num_samples=300,
+        output_limits=[0, 100],
+        model_kwargs={"gain": 3.5},
+        chunk_size=5,
+        max_workers=2
+    )
+    progress = []
+    trajectories = sweep.run(parameters, progress=lambda done, total: progress.append(done))
+    assert trajectories.shape == (18, 300)
+    assert progress[-1] == 18
+    np.testing.assert_allclose(trajectories, sweep.evaluate(parameters))
+
+    sweep.metric = final_value
+    np.testing.assert_allclose(sweep.run(parameters), trajectories[:, -1])
+
+    sweep.metric = None
+    sweep.criteria = [SettledCriterion(band=2.0, duration=0.1)]
+    stopped = sweep.run(parameters)
+    finished = np.isnan(stopped[:, -1])
+    assert finished.any() and not finished.all()
+    valid = ~np.isnan(stopped)
+    np.testing.assert_allclose(stopped[valid], trajectories[valid])
+
+
+def main():
+    test_parameter_sweep()
+
+
+if __name__ == "__main__":
+    main()